@@ -1,19 +1,23 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context
+import json
 import tempfile
-import librosa
+import time
 import numpy as np
 import os
-import base64
-from io import BytesIO
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+import threading
 from src.pipeline.prediction_pipeline import AudioPredictor
-from visualizer import (
-    plot_waveform, plot_mel_spectrogram, plot_zcr, plot_rmse
+from src.utils.feature_cache import FeatureCache
+from src.utils.upload_store import UploadStore
+import atexit
+from src.pipeline.serving_pool import (
+    BoundedWorkerPool, PoolSaturated, PoolTimeout,
+    predict_task, predict_batch_task, render_task
 )
+from visualizer import VIZ_TYPES, render_visualization
 from src.logger import logging
 from src.exception import MyException
+from src.constants import MAX_BATCH_CONTENT_LENGTH, SERVE_WORKERS, SERVE_RETRY_AFTER_SECONDS
+from werkzeug.wsgi import ClosingIterator
 import sys 
 
 app = Flask(__name__)
@@ -21,17 +25,116 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
 DAGSHUB_TRACKING_URL = "https://dagshub.com/Himanshu0518/Accent-Recognition.mlflow"
 
-# Initialize predictor
-predictor = AudioPredictor()
+# The predictor (model resolution + warm-up) is created on first use rather
+# than at import, so importing the app stays cheap. serve.py starts it in the
+# background and /healthz reports when it is ready.
+predictor = None
+_predictor_lock = threading.Lock()
 
-def fig_to_base64(fig):
-    """Convert matplotlib figure to base64 string"""
-    img = BytesIO()
-    fig.savefig(img, format='png', bbox_inches='tight', dpi=100, facecolor='white')
-    img.seek(0)
-    plot_url = base64.b64encode(img.getvalue()).decode()
-    plt.close(fig)
-    return plot_url
+def get_predictor():
+    global predictor
+    with _predictor_lock:
+        if predictor is None:
+            startup_start = time.perf_counter()
+            instance = AudioPredictor(feature_cache=FeatureCache())
+            instance.warm_up()
+            predictor = instance
+            logging.info(f"Predictor ready in {time.perf_counter() - startup_start:.2f}s "
+                         f"(model from {predictor.model_source})")
+    return predictor
+
+# Per-upload session store (temp files + decoded waveform LRU)
+uploads = UploadStore()
+ingestor = uploads.ingestor
+atexit.register(uploads.clear)
+
+def get_upload():
+    """Look up the upload referenced by the request's upload_id"""
+    data = request.get_json(silent=True) or {}
+    upload_id = data.get('upload_id') or request.form.get('upload_id')
+    if not upload_id:
+        return None, None
+    return upload_id, uploads.get(upload_id)
+
+# Async serving mode: with SERVE_WORKERS > 0, decode/extract/inference and
+# plotting run in a bounded process pool so one slow request cannot stall the
+# others; when the pool is full requests get 503 instead of queueing.
+pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global pool
+    with _pool_lock:
+        if pool is None and SERVE_WORKERS > 0:
+            pool = BoundedWorkerPool(SERVE_WORKERS)
+            atexit.register(pool.shutdown)
+    return pool
+
+# Graceful shutdown (see serve.py): once draining, every request, /healthz
+# included, gets 503 while the requests already in flight finish. A request
+# counts as in flight until its response has been fully sent.
+_draining = threading.Event()
+_in_flight = 0
+_idle = threading.Condition()
+
+class _DrainMiddleware:
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def _done(self):
+        global _in_flight
+        with _idle:
+            _in_flight -= 1
+            _idle.notify_all()
+
+    def __call__(self, environ, start_response):
+        global _in_flight
+        if _draining.is_set():
+            body = json.dumps({'error': 'Server is shutting down. Please retry.', 'draining': True}).encode()
+            start_response('503 SERVICE UNAVAILABLE', [('Content-Type', 'application/json'),
+                                                      ('Content-Length', str(len(body))),
+                                                      ('Retry-After', str(SERVE_RETRY_AFTER_SECONDS))])
+            return [body]
+        with _idle:
+            _in_flight += 1
+        try:
+            return ClosingIterator(self.wsgi_app(environ, start_response), [self._done])
+        except BaseException:
+            self._done()
+            raise
+
+app.wsgi_app = _DrainMiddleware(app.wsgi_app)
+
+def begin_drain():
+    """Reject new requests with 503 from now on."""
+    _draining.set()
+
+def wait_idle(timeout):
+    """Wait up to `timeout` seconds for in-flight requests; returns how many are left."""
+    with _idle:
+        _idle.wait_for(lambda: _in_flight == 0, timeout=timeout)
+        return _in_flight
+
+@app.errorhandler(PoolSaturated)
+def pool_saturated(e):
+    response = jsonify({'error': f'Server busy: {e}. Please retry.'})
+    response.headers['Retry-After'] = str(SERVE_RETRY_AFTER_SECONDS)
+    return response, 503
+
+@app.errorhandler(PoolTimeout)
+def pool_timeout(e):
+    return jsonify({'error': f'Request timed out: {e}'}), 504
+
+@app.route('/healthz')
+def healthz():
+    if predictor is None:
+        return jsonify({'ready': False}), 503
+    status = {'ready': True, 'model_source': predictor.model_source}
+    if predictor.batcher is not None:
+        status['batching'] = predictor.batcher.stats()
+    if pool is not None:
+        status['pool'] = pool.stats()
+    return jsonify(status)
 
 @app.route('/')
 def index():
@@ -40,7 +143,7 @@ def index():
 @app.route('/upload', methods=['POST'])
 def upload_audio():
     logging.info("Upload route called")
-    logging.info("Request files:", request.files.keys())
+    logging.info(f"Request files: {list(request.files.keys())}")
     print("Request form:", request.form.keys())
     
     if 'audio' not in request.files:
@@ -67,18 +170,20 @@ def upload_audio():
             tmp_path = tmp.name
         
         
-        # Load audio for basic info
-        y, sr = librosa.load(tmp_path, sr=None)
-        duration = len(y) / sr
+        # Header only; the samples are decoded once on first visualize/predict
+        try:
+            info = ingestor.probe(tmp_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        upload_id = uploads.add(tmp_path, file.filename)
+        duration = info.duration
+        sr = info.sample_rate
         logging.info(f"sampling rate: {sr}")
-       
-        
-        # Store file path in session or temporary storage
-        # For production, consider using Redis or database
-        app.config['TEMP_FILE_PATH'] = tmp_path
         
         return jsonify({
             'success': True,
+            'upload_id': upload_id,
             'duration': duration,
             'sample_rate': sr,
             'filename': file.filename
@@ -88,49 +193,63 @@ def upload_audio():
         print(f"Error processing audio: {str(e)}")
         return jsonify({'error': f'Error processing audio: {str(e)}'}), 500
 
+@app.route('/upload/<upload_id>', methods=['DELETE'])
+def delete_upload(upload_id):
+    uploads.remove(upload_id)
+    return jsonify({'success': True})
+
 @app.route('/visualize', methods=['POST'])
 def visualize():
     data = request.json
     viz_type = data.get('type', 'waveform')
+    # 'image' renders a PNG server-side; 'data' returns arrays for the browser to draw
+    mode = data.get('mode', 'image')
     
-    if 'TEMP_FILE_PATH' not in app.config:
+    upload_id, entry = get_upload()
+    if entry is None:
         return jsonify({'error': 'No audio file uploaded'}), 400
-    
-    tmp_path = app.config['TEMP_FILE_PATH']
+    if viz_type not in VIZ_TYPES or mode not in ('image', 'data'):
+        return jsonify({'error': 'Invalid visualization type'}), 400
     
     try:
-        y, sr = librosa.load(tmp_path, sr=None)
-        
-        if viz_type == 'waveform':
-            fig = plot_waveform(y, sr)
-        elif viz_type == 'mel_spectrogram':
-            fig = plot_mel_spectrogram(y, sr)
-        elif viz_type == 'zcr':
-            fig = plot_zcr(y)
-        elif viz_type == 'rmse':
-            fig = plot_rmse(y)
-        else:
-            return jsonify({'error': 'Invalid visualization type'}), 400
-        
-        plot_url = fig_to_base64(fig)
+        render = uploads.get_render(upload_id, (viz_type, mode))
+        if render is None:
+            audio = uploads.audio(upload_id)
+            if get_pool() is not None:
+                render = pool.run(render_task, audio.y, audio.sr, viz_type, mode)
+            else:
+                render = render_visualization(audio.y, audio.sr, viz_type, mode)
+            uploads.put_render(upload_id, (viz_type, mode), render)
         
+        if mode == 'data':
+            return jsonify({
+                'success': True,
+                'type': viz_type,
+                'data': render
+            })
+
         return jsonify({
             'success': True,
-            'plot': plot_url
+            'plot': render
         })
     
+    except (PoolSaturated, PoolTimeout):
+        raise
     except Exception as e:
         return jsonify({'error': f'Error generating visualization: {str(e)}'}), 500
 
 @app.route('/predict', methods=['POST'])
 def predict():
-    if 'TEMP_FILE_PATH' not in app.config:
+    upload_id, entry = get_upload()
+    if entry is None:
         return jsonify({'error': 'No audio file uploaded'}), 400
     
-    tmp_path = app.config['TEMP_FILE_PATH']
-    
     try:
-        result = predictor.predict(tmp_path)
+        audio = uploads.audio(upload_id)
+        if get_pool() is not None:
+            result = pool.run(predict_task, entry.path, audio.y, audio.sr)
+        else:
+            result = get_predictor().predict(entry.path, audio=audio)
         
         return jsonify({
                 'success': True,
@@ -139,12 +258,75 @@ def predict():
                 
             })
     
+    except (PoolSaturated, PoolTimeout):
+        raise
     except Exception as e:
         return jsonify({'error': f'Prediction failed: {str(e)}'}), 500
 
+@app.route('/predict_stream', methods=['POST'])
+def predict_stream():
+    _, entry = get_upload()
+    if entry is None:
+        return jsonify({'error': 'No audio file uploaded'}), 400
+
+    tmp_path = entry.path
+
+    def generate():
+        # One JSON object per line, flushed as each window is scored
+        try:
+            for result in get_predictor().predict_stream(tmp_path):
+                result['accent'] = result['accent'].capitalize()
+                result['running_accent'] = result['running_accent'].capitalize()
+                yield json.dumps(result) + '\n'
+        except Exception as e:
+            yield json.dumps({'error': f'Prediction failed: {str(e)}'}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    # Batches are allowed a larger body than single uploads
+    request.max_content_length = MAX_BATCH_CONTENT_LENGTH
+
+    files = request.files.getlist('audio')
+    if not files:
+        return jsonify({'error': 'No audio files provided'}), 400
+
+    results = [{'filename': f.filename} for f in files]
+    sources, positions = [], []
+    for i, file in enumerate(files):
+        if not file.filename.lower().endswith('.wav'):
+            results[i]['error'] = 'Please upload a .wav file'
+            continue
+        sources.append(file.read())
+        positions.append(i)
+
+    try:
+        if get_pool() is not None:
+            batch = pool.run(predict_batch_task, sources)
+        else:
+            batch = get_predictor().predict_batch(sources)
+        for pos, result in zip(positions, batch):
+            if 'error' in result:
+                results[pos]['error'] = result['error']
+            else:
+                results[pos]['predicted_accent'] = result['accent'].capitalize()
+
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+
+    except (PoolSaturated, PoolTimeout):
+        raise
+    except Exception as e:
+        return jsonify({'error': f'Batch prediction failed: {str(e)}'}), 500
+
 @app.errorhandler(413)
 def too_large(e):
-    return jsonify({'error': 'File too large. Maximum size is 16MB.'}), 413
+    # /predict_batch raises the limit per request; report the one that applied
+    limit = request.max_content_length or app.config['MAX_CONTENT_LENGTH']
+    return jsonify({'error': f'File too large. Maximum size is {limit // (1024 * 1024)}MB.'}), 413
 
 if __name__ == "__main__":
     import os
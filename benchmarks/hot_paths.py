@@ -0,0 +1,302 @@
+# benchmarks/hot_paths.py
+#
+# Microbenchmarks for the audio and inference hot paths, run on synthetic
+# clips at every BENCHMARK_DURATIONS x BENCHMARK_SAMPLE_RATES combination and
+# compared against a JSON baseline recorded on the same machine, e.g.
+#
+#   python -m benchmarks.hot_paths --update-baseline     # record the baseline
+#   python -m benchmarks.hot_paths                       # compare against it
+#   python -m benchmarks.hot_paths --filter "decode/*"
+#
+# exits with status 1 when a case's median is more than --threshold slower
+# than its baseline, or when a baseline case could not be measured.
+
+import os
+
+# Benchmark the local model artifacts; never reach out to the registry
+os.environ.setdefault("ACCENT_MODEL_OFFLINE", "1")
+
+import sys
+import json
+import time
+import fnmatch
+import argparse
+import platform
+import tempfile
+import functools
+import librosa
+import numpy as np
+import soundfile as sf
+from src.constants import (
+    SAMPLE_RATE, DURATION, RANDOM_STATE, BENCHMARK_BASELINE_PATH, BENCHMARK_RESULTS_PATH,
+    BENCHMARK_DURATIONS, BENCHMARK_SAMPLE_RATES, BENCHMARK_REPEATS,
+    BENCHMARK_REGRESSION_THRESHOLD, BENCHMARK_NOISE_FLOOR_MS
+)
+from src.components.audio_ingestion import AudioIngestor
+from src.components.data_augmentation import DataAugmentor
+from src.components.feature_extraction import FeatureExtractor
+from visualizer import VIZ_TYPES, render_visualization
+
+
+def synthetic_clip(duration, sr, seed=RANDOM_STATE):
+    """
+    Speech-like test signal: a gliding harmonic tone under a syllable-rate
+    envelope, plus a little noise.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sr)) / sr
+    f0 = 120 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = sum(np.sin(k * phase) / k for k in range(1, 11))
+    y *= 0.5 * (1 + np.sin(2 * np.pi * 4 * t))
+    y += 0.01 * rng.standard_normal(len(t))
+    return (0.3 * y / np.abs(y).max()).astype(np.float32)
+
+
+def clip_name(duration, sr):
+    return f"{sr}hz/{duration:g}s"
+
+
+def write_clips(folder, durations, sample_rates):
+    """
+    Write one 16-bit WAV per (duration, sample rate); returns {(duration, sr): path}.
+    """
+    paths = {}
+    for duration in durations:
+        for sr in sample_rates:
+            path = os.path.join(folder, f"synthetic_{sr}hz_{duration:g}s.wav")
+            sf.write(path, synthetic_clip(duration, sr), sr, subtype="PCM_16")
+            paths[duration, sr] = path
+    return paths
+
+
+@functools.cache
+def _predictor():
+    """
+    (predictor, None), or (None, error) when no local model could be loaded,
+    so every predict case is skipped after a single attempt.
+    """
+    from src.pipeline.prediction_pipeline import AudioPredictor
+
+    try:
+        # No micro-batching: time the request path itself, not the batching window
+        return AudioPredictor(batch_window_ms=0), None
+    except Exception as e:
+        return None, e
+
+
+def build_cases(paths):
+    """
+    [(name, setup)] for every benchmark; setup() prepares the inputs and
+    returns the zero-argument callable to time.
+    """
+    ingestor = AudioIngestor()
+    augmentor = DataAugmentor()
+    extractor = FeatureExtractor()
+
+    def model_input(path):
+        # What the training and serving paths feed the augmentor / extractor
+        return augmentor._pad_or_trim(ingestor.load(path, SAMPLE_RATE, DURATION))
+
+    def predict(path):
+        predictor, error = _predictor()
+        if error is not None:
+            raise error
+        if predictor.predict(path) is None:
+            raise RuntimeError("AudioPredictor.predict returned None (see the log)")
+        return lambda: predictor.predict(path)
+
+    def visualize(path, viz_type, mode):
+        audio = ingestor.decode(path)
+        return lambda: render_visualization(audio.y, audio.sr, viz_type, mode)
+
+    cases = []
+    for (duration, sr), path in paths.items():
+        clip = clip_name(duration, sr)
+        cases += [
+            (f"decode/librosa_load/{clip}", lambda p=path: lambda: librosa.load(p, sr=SAMPLE_RATE)),
+            (f"decode/ingestor_load/{clip}", lambda p=path: lambda: ingestor.load(p, SAMPLE_RATE)),
+            (f"decode/soundfile_read/{clip}", lambda p=path: lambda: sf.read(p, dtype="float32")),
+            (f"augment/augment_one/{clip}",
+             lambda p=path: functools.partial(augmentor.augment_one, model_input(p), 0)),
+            (f"features/extract_features/{clip}",
+             lambda p=path: functools.partial(extractor.extract_features, model_input(p))),
+            (f"predict/predict/{clip}", lambda p=path: predict(p)),
+        ]
+        for viz_type in VIZ_TYPES:
+            for mode in ("data", "image"):
+                cases.append((f"visualize/{viz_type}_{mode}/{clip}",
+                              lambda p=path, v=viz_type, m=mode: visualize(p, v, m)))
+    return cases
+
+
+def measure(fn, repeats):
+    """
+    Median, p90 and min wall time in ms over `repeats` calls, after one
+    warm-up call (lazy imports, JIT compilation, first-call allocations).
+    """
+    fn()
+    elapsed = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn()
+        elapsed[i] = time.perf_counter() - start
+    elapsed *= 1000
+    return {
+        "median_ms": round(float(np.median(elapsed)), 4),
+        "p90_ms": round(float(np.percentile(elapsed, 90)), 4),
+        "min_ms": round(float(elapsed.min()), 4),
+        "repeats": repeats,
+    }
+
+
+def machine_info() -> dict:
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "librosa": librosa.__version__,
+    }
+
+
+def run(patterns=None, durations=BENCHMARK_DURATIONS, sample_rates=BENCHMARK_SAMPLE_RATES,
+        repeats=BENCHMARK_REPEATS) -> dict:
+    """
+    Run every case whose name matches one of `patterns` (fnmatch, all cases
+    if None). A case whose setup or timed calls fail (e.g. no local model
+    artifact for predict) is recorded as skipped with the reason.
+    """
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        "scope": {"patterns": patterns,
+                  "clips": [clip_name(duration, sr) for duration in durations for sr in sample_rates]},
+        "cases": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="accent-bench-") as folder:
+        cases = [(name, setup) for name, setup in build_cases(write_clips(folder, durations, sample_rates))
+                 if patterns is None or any(fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+        for name, setup in cases:
+            try:
+                stats = measure(setup(), repeats)
+            except Exception as e:
+                results["cases"][name] = {"skipped": repr(e)[:300]}
+                print(f"{name:48s} skipped: {e}")
+                continue
+            results["cases"][name] = stats
+            print(f"{name:48s} median {stats['median_ms']:10.3f} ms   p90 {stats['p90_ms']:10.3f} ms")
+    return results
+
+
+def _in_scope(name, scope):
+    """
+    Whether the run described by `scope` was meant to measure case `name`.
+    """
+    patterns = scope["patterns"]
+    return (any(name.endswith("/" + clip) for clip in scope["clips"])
+            and (patterns is None or any(fnmatch.fnmatch(name, pattern) for pattern in patterns)))
+
+
+def compare(results, baseline, threshold=BENCHMARK_REGRESSION_THRESHOLD,
+            noise_floor_ms=BENCHMARK_NOISE_FLOOR_MS) -> list[dict]:
+    """
+    One row per case of the run and per baseline case within its scope, with
+    a status of "regression", "improved", "ok", "new" (no baseline yet),
+    "skipped" (failed, no baseline) or "missing" (has a baseline but was not
+    measured: its setup or calls failed, or the case no longer exists).
+    A regression is a median more than `threshold` (a fraction) above the
+    baseline and more than noise_floor_ms slower in absolute terms.
+    """
+    rows = []
+    baseline_cases = baseline.get("cases", {})
+    for name, base in baseline_cases.items():
+        if name not in results["cases"] and _in_scope(name, results["scope"]):
+            rows.append({"case": name, "median_ms": None, "baseline_ms": base.get("median_ms"),
+                         "status": "missing", "error": "case not run"})
+
+    for name, stats in results["cases"].items():
+        base = baseline_cases.get(name, {})
+        if "median_ms" not in stats:
+            rows.append({"case": name, "median_ms": None, "baseline_ms": base.get("median_ms"),
+                         "status": "skipped" if not base else "missing", "error": stats["skipped"]})
+            continue
+        row = {"case": name, "median_ms": stats["median_ms"], "baseline_ms": base.get("median_ms")}
+        if row["baseline_ms"] is None:
+            row["status"] = "new"
+        else:
+            row["ratio"] = round(stats["median_ms"] / max(row["baseline_ms"], 1e-9), 4)
+            slower_ms = stats["median_ms"] - row["baseline_ms"]
+            if row["ratio"] > 1 + threshold and slower_ms > noise_floor_ms:
+                row["status"] = "regression"
+            elif row["ratio"] < 1 / (1 + threshold):
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def load_baseline(path) -> dict:
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the audio and inference hot paths.")
+    parser.add_argument("--filter", action="append", dest="patterns", metavar="PATTERN",
+                        help="only run cases matching this fnmatch pattern (repeatable), e.g. 'decode/*'")
+    parser.add_argument("--durations", type=float, nargs="+", default=list(BENCHMARK_DURATIONS))
+    parser.add_argument("--sample-rates", type=int, nargs="+", default=list(BENCHMARK_SAMPLE_RATES))
+    parser.add_argument("--repeats", type=int, default=BENCHMARK_REPEATS, help="timed calls per case")
+    parser.add_argument("--threshold", type=float, default=BENCHMARK_REGRESSION_THRESHOLD,
+                        help="allowed slowdown of a median as a fraction of its baseline")
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE_PATH)
+    parser.add_argument("--output", default=BENCHMARK_RESULTS_PATH, help="where to write this run's results")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="record this run as the baseline for the cases it measured")
+    args = parser.parse_args(argv)
+
+    results = run(args.patterns, args.durations, args.sample_rates, args.repeats)
+    baseline = load_baseline(args.baseline)
+    if baseline and baseline.get("machine") != results["machine"]:
+        print(f"WARNING: the baseline in {args.baseline} was recorded on a different machine or "
+              f"library versions; timings may not be comparable")
+
+    rows = compare(results, baseline, args.threshold)
+    results["comparison"] = {"baseline": args.baseline, "threshold": args.threshold, "cases": rows}
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    regressions = [row for row in rows if row["status"] == "regression"]
+    missing = [row for row in rows if row["status"] == "missing"]
+    for row in rows:
+        if row["status"] in ("regression", "improved"):
+            print(f"{row['status'].upper():10s} {row['case']}: {row['median_ms']:.3f} ms "
+                  f"vs baseline {row['baseline_ms']:.3f} ms ({row['ratio']:.2f}x)")
+        elif row["status"] == "missing":
+            print(f"MISSING    {row['case']}: {row['error']}")
+    print(f"{len(rows)} cases, {len(regressions)} regressions (threshold +{args.threshold:.0%}), "
+          f"{len(missing)} missing; results in {args.output}")
+
+    if args.update_baseline:
+        measured = {name: stats for name, stats in results["cases"].items() if "median_ms" in stats}
+        # Keep the cases this run did not measure, unless they came from another machine
+        cases = baseline.get("cases", {}) if baseline.get("machine") == results["machine"] else {}
+        baseline = {"created_at": results["created_at"], "machine": results["machine"],
+                    "cases": {**cases, **measured}}
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline for {len(measured)} cases written to {args.baseline}")
+        return 0
+    return 1 if regressions or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+# serve.py
+#
+# Fast-start entry point for the inference service. The port is bound right
+# away while the model is resolved and warmed up in a background thread;
+# /healthz returns 503 until the predictor is ready. Unlike `python app.py`
+# this runs without the debug reloader, which imports everything twice.
+#
+# With ACCENT_SERVE_WORKERS=N the CPU-bound work runs in N worker processes
+# (async serving mode, see src/pipeline/serving_pool.py). SIGTERM puts the
+# service in draining mode (new requests and /healthz get 503), waits up to
+# SERVE_DRAIN_SECONDS for in-flight requests to be sent, then stops the server.
+
+import os
+import signal
+import threading
+from werkzeug.serving import make_server
+from app import app, get_predictor, get_pool, begin_drain, wait_idle
+from src.constants import SERVE_DRAIN_SECONDS
+from src.logger import logging
+
+server = None
+
+def init_service():
+    serving_pool = get_pool()
+    if serving_pool is not None:
+        serving_pool.warm_up()
+    get_predictor()
+
+def drain_and_stop(timeout=SERVE_DRAIN_SECONDS):
+    begin_drain()
+    remaining = wait_idle(timeout)
+    if remaining:
+        logging.warning(f"{remaining} request(s) still in flight after {timeout:g}s; stopping anyway")
+    serving_pool = get_pool()
+    if serving_pool is not None:
+        serving_pool.shutdown(wait=not remaining)
+    # Returns once serve_forever() has exited in the main thread
+    server.shutdown()
+
+def handle_sigterm(signum, frame):
+    logging.info("SIGTERM received, draining requests")
+    # server.shutdown() blocks until serve_forever() returns, so it cannot
+    # run in the main thread that is serving
+    threading.Thread(target=drain_and_stop, name="drain", daemon=True).start()
+
+if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    threading.Thread(target=init_service, name="predictor-init", daemon=True).start()
+
+    port = int(os.environ.get("PORT", 8000))
+    server = make_server("0.0.0.0", port, app, threaded=True)
+    logging.info(f"Starting inference service on port {port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        logging.info("Inference service stopped")
@@ -0,0 +1,154 @@
+# src/components/audio_ingestion.py
+
+import sys
+import time
+import numpy as np
+import soundfile as sf
+import librosa
+from src.logger import logging
+from src.constants import RESAMPLE_TYPE
+from src.exception import MyException
+
+
+class AudioInfo:
+    """
+    Header metadata of an audio file, read without decoding any samples.
+    """
+
+    def __init__(self, sample_rate, channels, frames):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = frames
+
+    @property
+    def duration(self):
+        return self.frames / self.sample_rate
+
+    def to_dict(self):
+        return {
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "frames": self.frames,
+            "duration": self.duration,
+        }
+
+
+class DecodedAudio:
+    """
+    A clip decoded once to float32 mono at its native rate. Resampled versions
+    are computed at most once per (sample rate, duration) and shared as
+    read-only arrays with every consumer.
+    """
+
+    def __init__(self, y, sr, ingestor):
+        y.flags.writeable = False
+        self.y = y
+        self.sr = sr
+        self._ingestor = ingestor
+        self._resampled = {}
+
+    @property
+    def duration(self):
+        return len(self.y) / self.sr
+
+    @property
+    def nbytes(self):
+        return self.y.nbytes + sum(y.nbytes for y in self._resampled.values())
+
+    def at(self, sr, duration=None):
+        """
+        Return the clip at sample rate `sr`, limited to the first `duration`
+        seconds (same semantics as librosa.load(sr=sr, duration=duration)).
+        """
+        key = (sr, duration)
+        if key not in self._resampled:
+            y = self.y
+            if duration is not None:
+                y = y[:int(duration * self.sr)]
+            if sr != self.sr:
+                y = self._ingestor.resample(y, self.sr, sr)
+                y.flags.writeable = False
+            self._resampled[key] = y
+        return self._resampled[key]
+
+
+class AudioIngestor:
+    """
+    Shared decode-once / resample-once entry point for audio, used by the web
+    app, the predictor and the training pipeline.
+
+    Decoding goes through soundfile (falling back to librosa/audioread for
+    formats libsndfile cannot read) and resampling through librosa.resample
+    with a selectable res_type, trading quality for speed. Time spent in
+    decode and in resample is accumulated separately.
+    """
+
+    def __init__(self, res_type=RESAMPLE_TYPE):
+        self.res_type = res_type
+        self.decode_seconds = 0.0
+        self.resample_seconds = 0.0
+        self.decodes = 0
+        self.resamples = 0
+
+    def probe(self, source):
+        """
+        Read sample rate, channel count and length from the file header only.
+        """
+        try:
+            info = sf.info(source)
+            if hasattr(source, "seek"):
+                source.seek(0)
+            return AudioInfo(info.samplerate, info.channels, info.frames)
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def decode(self, source, duration=None):
+        """
+        Decode to float32 mono at the native sample rate.
+        """
+        start = time.perf_counter()
+        try:
+            try:
+                with sf.SoundFile(source) as f:
+                    sr = f.samplerate
+                    frames = -1 if duration is None else int(duration * sr)
+                    y = f.read(frames=frames, dtype="float32", always_2d=True)
+                y = np.mean(y, axis=1, dtype=np.float32) if y.shape[1] > 1 else y[:, 0]
+            except sf.LibsndfileError:
+                if hasattr(source, "seek"):
+                    source.seek(0)
+                y, sr = librosa.load(source, sr=None, duration=duration)
+        except Exception as e:
+            raise MyException(e, sys)
+        finally:
+            self.decode_seconds += time.perf_counter() - start
+            self.decodes += 1
+        return DecodedAudio(np.ascontiguousarray(y), sr, self)
+
+    def resample(self, y, orig_sr, target_sr):
+        if orig_sr == target_sr:
+            return y
+        start = time.perf_counter()
+        try:
+            return librosa.resample(y, orig_sr=orig_sr, target_sr=target_sr,
+                                    res_type=self.res_type).astype(np.float32, copy=False)
+        finally:
+            self.resample_seconds += time.perf_counter() - start
+            self.resamples += 1
+
+    def load(self, source, sr, duration=None):
+        """
+        Decode and resample in one go; drop-in for librosa.load(...)[0].
+        """
+        return self.decode(source, duration=duration).at(sr)
+
+    def timings(self):
+        return {
+            "decodes": self.decodes,
+            "decode_seconds": round(self.decode_seconds, 4),
+            "resamples": self.resamples,
+            "resample_seconds": round(self.resample_seconds, 4),
+        }
+
+    def log_timings(self):
+        logging.info(f"Audio ingestion timings: {self.timings()}")
@@ -1,17 +1,57 @@
 # src/components/augment_and_save.py
+import os
 import sys
+import zlib
 import librosa
 import numpy as np
+import scipy.fft
+from from_root import from_root
 from src.logger import logging
 from src.constants import *
 from src.exception import MyException
+from src.utils.main_utils import read_yaml
+
+
+def load_augmentation_recipe(params_path=None):
+    """
+    The `augmentation` section of params.yaml merged over AUGMENTATION_RECIPE.
+    """
+    params_path = params_path or os.path.join(from_root(), "params.yaml")
+    recipe = dict(AUGMENTATION_RECIPE)
+    if os.path.exists(params_path):
+        recipe.update((read_yaml(params_path) or {}).get("augmentation") or {})
+    return recipe
+
 
 class DataAugmentor:
-    def __init__(self, sr=SAMPLE_RATE, duration=DURATION):
+    """
+    Batched augmentation engine driven by a recipe:
+
+        seed                seed for the per-clip noise generators
+        time_stretch_rates  one time-stretched variant per rate
+        pitch_shift_steps   one pitch-shifted variant per semitone step
+        noise_levels        additive Gaussian noise with a fixed std
+        noise_snr_db        additive Gaussian noise at a target SNR per clip
+
+    A stack of clips goes through one float32 STFT that every stretch and
+    shift variant reuses: a pitch shift by n steps is a time stretch by
+    2**(-n/12) followed by a resample, exactly as librosa.effects.pitch_shift
+    does it, so only the phase vocoder and the inverse STFT run per variant.
+    Noise comes from a generator seeded by (recipe seed, clip seed), so the
+    output for a file does not depend on which batch or worker it landed in.
+    """
+
+    def __init__(self, sr=SAMPLE_RATE, duration=DURATION, recipe=None):
         self.sr = sr
         self.duration = duration
         self.target_len = int(sr * duration)
-        logging.info(f"[INIT] DataAugmentor initialized")
+        self.recipe = load_augmentation_recipe() if recipe is None else {**AUGMENTATION_RECIPE, **recipe}
+        self.seed = int(self.recipe["seed"])
+        self.stretch_rates = [float(r) for r in self.recipe["time_stretch_rates"]]
+        self.pitch_steps = [float(n) for n in self.recipe["pitch_shift_steps"]]
+        self.noise_levels = [float(level) for level in self.recipe["noise_levels"]]
+        self.noise_snr_db = [float(snr) for snr in self.recipe["noise_snr_db"]]
+        logging.info(f"[INIT] DataAugmentor initialized ({self.n_variants} variants per clip)")
 
     def _pad_or_trim(self, y):
         if len(y) > self.target_len:
@@ -20,18 +60,175 @@ class DataAugmentor:
             return np.pad(y, (0, self.target_len - len(y)))
         return y
 
-    def augment_one(self, y):
+    def config(self):
+        """
+        Settings that determine the augmented output (used for cache keys).
+        """
+        return {
+            "sample_rate": self.sr,
+            "duration": self.duration,
+            "augmentation": {
+                "seed": self.seed,
+                "time_stretch_rates": self.stretch_rates,
+                "pitch_shift_steps": self.pitch_steps,
+                "noise_levels": self.noise_levels,
+                "noise_snr_db": self.noise_snr_db,
+            },
+        }
+
+    def variant_names(self):
+        return ([f"stretch_{r:g}" for r in self.stretch_rates]
+                + [f"shift_{n:g}" for n in self.pitch_steps]
+                + [f"noise_{level:g}" for level in self.noise_levels]
+                + [f"snr_{snr:g}db" for snr in self.noise_snr_db])
+
+    @property
+    def n_variants(self):
+        return len(self.variant_names())
+
+    @staticmethod
+    def clip_seed(file_path):
+        """Stable per-file seed (independent of directory, batch and process)."""
+        return zlib.crc32(os.path.basename(file_path).encode("utf-8"))
+
+    @staticmethod
+    def _analyse(Y):
+        """
+        Shared analysis for every stretch/shift variant: the STFT magnitude,
+        the initial phase and the wrapped phase increment between consecutive
+        frames, all frames-first (n_clips, n_frames, n_bins) float32.
+        """
+        D = librosa.stft(Y, hop_length=HOP_LENGTH_STRETCH)
+        # Two zero frames so interpolation at the last step stays in range
+        D = np.pad(D, [(0, 0), (0, 0), (0, 2)]).transpose(0, 2, 1)
+        n_fft = 2 * (D.shape[-1] - 1)
+        phi_advance = (HOP_LENGTH_STRETCH * librosa.fft_frequencies(sr=2 * np.pi, n_fft=n_fft)).astype(np.float32)
+
+        mag = np.ascontiguousarray(np.abs(D))
+        phase = np.angle(D)
+        dphase = phase[:, 1:] - phase[:, :-1] - phi_advance
+        dphase -= np.float32(2.0 * np.pi) * np.round(dphase / np.float32(2.0 * np.pi))
+        return mag, np.ascontiguousarray(phase[:, 0]), dphase
+
+    @staticmethod
+    def _phase_vocoder(mag, phase0, dphase, rate):
+        """
+        librosa.phase_vocoder vectorised over output frames.
+
+        Output frame k has phase phase0 + k * phi_advance + sum of the wrapped
+        increments at the k earlier steps. The k * phi_advance term is
+        computed in float64 and wrapped, so unlike librosa's float32 running
+        sum the phase does not lose precision on long clips.
+        """
+        n_fft = 2 * (mag.shape[-1] - 1)
+        time_steps = np.arange(0, mag.shape[1] - 2, rate, dtype=np.float64)
+        idx = time_steps.astype(np.intp)
+        alpha = np.mod(time_steps, 1.0).astype(np.float32)[:, np.newaxis]
+        stretched_mag = (1.0 - alpha) * mag[:, idx] + alpha * mag[:, idx + 1]
+
+        phi_advance = HOP_LENGTH_STRETCH * librosa.fft_frequencies(sr=2 * np.pi, n_fft=n_fft)
+        advance = np.mod(np.arange(len(idx))[:, np.newaxis] * phi_advance, 2.0 * np.pi).astype(np.float32)
+        acc = np.empty(stretched_mag.shape, dtype=np.float32)
+        acc[:, 0] = 0.0
+        np.cumsum(dphase[:, idx[:-1]], axis=1, out=acc[:, 1:])
+        acc += advance
+        acc += phase0[:, np.newaxis]
+
+        out = np.empty(acc.shape, dtype=np.complex64)
+        np.multiply(stretched_mag, np.cos(acc), out=out.real)
+        np.multiply(stretched_mag, np.sin(acc), out=out.imag)
+        return out
+
+    @staticmethod
+    def _istft(D, length):
+        """
+        librosa.istft (centred, periodic Hann, hop = n_fft / 4) for a
+        frames-first (n_clips, n_frames, n_bins) stack: one batched irfft,
+        then overlap-add of the four hop-sized quarters of every frame.
+        """
+        n_fft = 2 * (D.shape[-1] - 1)
+        hop = HOP_LENGTH_STRETCH
+        n_parts = n_fft // hop
+        # Only the frames that reach into the first `length` output samples
+        n_frames = min(D.shape[1], int(np.ceil((length + n_fft) / hop)))
+
+        window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n_fft) / n_fft)).astype(np.float32)
+        frames = scipy.fft.irfft(D[:, :n_frames], n=n_fft, axis=-1) * window
+        frames = frames.reshape(D.shape[0], n_frames, n_parts, hop)
+
+        y = np.zeros((D.shape[0], n_frames + n_parts - 1, hop), dtype=np.float32)
+        norm = np.zeros((n_frames + n_parts - 1, hop), dtype=np.float32)
+        window_sq = (window ** 2).reshape(n_parts, hop)
+        for q in range(n_parts):
+            y[:, q:q + n_frames] += frames[:, :, q]
+            norm[q:q + n_frames] += window_sq[q]
+
+        y = y.reshape(D.shape[0], -1)
+        norm = norm.reshape(-1)
+        nonzero = norm > np.finfo(np.float32).tiny
+        y[:, nonzero] /= norm[nonzero]
+        return librosa.util.fix_length(y[:, n_fft // 2:], size=length)
+
+    def _stretch(self, analysis, rate, n_samples, out_len):
+        """
+        librosa.effects.time_stretch from the shared analysis, keeping only
+        the first out_len samples of the round(n_samples / rate) long result.
+        """
+        return self._istft(self._phase_vocoder(*analysis, rate),
+                           length=min(int(round(n_samples / rate)), out_len))
+
+    def augment_batch(self, Y, seeds=None):
+        """
+        Augment a (n_clips, target_len) stack.
+
+        Returns a float32 array of shape (n_clips, n_variants, target_len) in
+        variant_names() order. `seeds` holds one clip seed per row (see
+        clip_seed); rows default to seed 0.
+        """
         try:
-            y_stretch = librosa.effects.time_stretch(y, rate=1.2)
-            y_shift = librosa.effects.pitch_shift(y, sr=self.sr, n_steps=2)
-            y_noise = y + 0.005 * np.random.randn(len(y))
-
-            return [
-                self._pad_or_trim(y_stretch),
-                 self._pad_or_trim(y_shift),
-                self._pad_or_trim(y_noise),
-            ]
+            Y = np.atleast_2d(np.asarray(Y, dtype=np.float32))
+            n_clips, n_samples = Y.shape
+            seeds = [0] * n_clips if seeds is None else list(seeds)
+            out = np.zeros((n_clips, self.n_variants, self.target_len), dtype=np.float32)
+            v = 0
+
+            if self.stretch_rates or self.pitch_steps:
+                analysis = self._analyse(Y)
+
+                for rate in self.stretch_rates:
+                    y = self._stretch(analysis, rate, n_samples, self.target_len)
+                    out[:, v, :y.shape[-1]] = y
+                    v += 1
+
+                for n_steps in self.pitch_steps:
+                    rate = 2.0 ** (-n_steps / 12)
+                    y = self._stretch(analysis, rate, n_samples, int(round(n_samples / rate)))
+                    y = librosa.resample(y, orig_sr=float(self.sr) / rate, target_sr=self.sr,
+                                         res_type=RESAMPLE_TYPE)
+                    y = librosa.util.fix_length(y, size=n_samples)[:, :self.target_len]
+                    out[:, v, :y.shape[-1]] = y
+                    v += 1
+
+            if self.noise_levels or self.noise_snr_db:
+                rngs = [np.random.default_rng([self.seed, seed]) for seed in seeds]
+                Y_fit = np.zeros((n_clips, self.target_len), dtype=np.float32)
+                Y_fit[:, :min(n_samples, self.target_len)] = Y[:, :self.target_len]
+                power = np.mean(Y_fit ** 2, axis=1, keepdims=True)
+
+                for level in self.noise_levels:
+                    noise = np.stack([rng.standard_normal(self.target_len, dtype=np.float32) for rng in rngs])
+                    out[:, v] = Y_fit + np.float32(level) * noise
+                    v += 1
+
+                for snr in self.noise_snr_db:
+                    noise = np.stack([rng.standard_normal(self.target_len, dtype=np.float32) for rng in rngs])
+                    sigma = np.sqrt(power / 10.0 ** (snr / 10.0)).astype(np.float32)
+                    out[:, v] = Y_fit + sigma * noise
+                    v += 1
+
+            return out
         except Exception as e:
-            raise MyException(e,sys)
+            raise MyException(e, sys)
 
-  
\ No newline at end of file
+    def augment_one(self, y, seed=0):
+        return list(self.augment_batch(self._pad_or_trim(y)[np.newaxis], [seed])[0])
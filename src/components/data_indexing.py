@@ -0,0 +1,141 @@
+# src/components/data_indexing.py
+
+import os
+import re
+import sys
+import json
+import argparse
+from src.logger import logging
+from src.exception import MyException
+from src.constants import RAW_DATA_DIR, DATASET_INDEX_PATH, LABELS, AUDIO_EXTENSIONS
+from src.components.audio_ingestion import AudioIngestor
+from src.utils.extraction_manifest import ExtractionManifest
+
+INDEX_FORMAT = "accent-dataset-index"
+INDEX_VERSION = 2
+
+
+def row_order_key(path: str, accents: list[str]):
+    """
+    Sort key for the canonical row order: clip number first, then accent in
+    LABELS order (indian_0, american_0, british_0, indian_1, ...), as the
+    original extraction loop produced rows. Files without a trailing _<n>
+    go last, by path.
+    """
+    parts = path.replace(os.sep, "/").split("/")
+    match = re.search(r"_(\d+)$", os.path.splitext(parts[-1])[0])
+    accent = accents.index(parts[0]) if parts[0] in accents else len(accents)
+    return (match is None, int(match.group(1)) if match else 0, accent, path)
+
+
+class CorruptAudioError(ValueError):
+    """Raised when the scan finds audio files whose header cannot be read."""
+
+
+class DatasetIndexer:
+    """
+    Scans RAW_DATA_DIR once and records every clip in a compact index:
+    relative path, label (from the accent directory, see LABELS), duration,
+    sample rate, channel count, frame count, size/mtime and SHA-256.
+
+    Only headers are read (soundfile.info); no samples are decoded. Hashes
+    from the previous index are reused for files whose size and mtime are
+    unchanged. Files whose header is unreadable or that contain no frames
+    make the scan fail before any stage starts working on the data, unless
+    skip_corrupt is set.
+
+    Records are kept in the canonical row order of every stage that consumes
+    the index (see row_order_key), so splits and metrics stay comparable
+    with runs made before the index existed.
+    """
+
+    def __init__(self, data_dir: str = RAW_DATA_DIR, index_path: str | None = DATASET_INDEX_PATH,
+                 labels: dict = LABELS):
+        self.data_dir = data_dir
+        self.index_path = index_path
+        self.labels = labels
+        self.ingestor = AudioIngestor()
+
+    def _iter_audio_files(self):
+        for accent, label in self.labels.items():
+            accent_dir = os.path.join(self.data_dir, accent)
+            if not os.path.isdir(accent_dir):
+                logging.warning(f"[INDEX] No directory for {accent} under {self.data_dir}")
+                continue
+            for root, _, names in os.walk(accent_dir):
+                for name in names:
+                    if name.lower().endswith(AUDIO_EXTENSIONS):
+                        yield os.path.join(root, name), label
+
+    def scan(self, previous: list[dict] | None = None, skip_corrupt: bool = False) -> list[dict]:
+        previous = {record["path"]: record for record in previous or []}
+        records, corrupt = [], []
+
+        for file_path, label in self._iter_audio_files():
+            rel_path = os.path.relpath(file_path, self.data_dir)
+            try:
+                info = self.ingestor.probe(file_path)
+                if info.frames == 0:
+                    raise ValueError("no audio frames")
+            except Exception as e:
+                corrupt.append((rel_path, e))
+                continue
+            records.append({
+                "path": rel_path,
+                "label": label,
+                "duration": round(info.duration, 4),
+                "sample_rate": info.sample_rate,
+                "channels": info.channels,
+                "frames": info.frames,
+                **ExtractionManifest.describe(file_path, previous.get(rel_path)),
+            })
+
+        if corrupt:
+            details = "; ".join(f"{path} ({e})" for path, e in corrupt)
+            if not skip_corrupt:
+                raise CorruptAudioError(f"{len(corrupt)} unreadable audio file(s): {details}")
+            logging.warning(f"[INDEX] Skipping {len(corrupt)} unreadable audio file(s): {details}")
+
+        accents = list(self.labels)
+        records.sort(key=lambda record: row_order_key(record["path"], accents))
+        logging.info(f"[INDEX] {len(records)} clips indexed under {self.data_dir} "
+                     f"({sum(r['duration'] for r in records) / 3600:.2f} h of audio)")
+        return records
+
+    def load(self) -> list[dict] | None:
+        if self.index_path is None or not os.path.isfile(self.index_path):
+            return None
+        with open(self.index_path, "r") as f:
+            index = json.load(f)
+        if index.get("format") != INDEX_FORMAT or index.get("version") != INDEX_VERSION:
+            return None
+        return index["records"]
+
+    def save(self, records: list[dict]) -> None:
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"format": INDEX_FORMAT, "version": INDEX_VERSION, "records": records}, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+        logging.info(f"[INDEX] Dataset index written to {self.index_path}")
+
+    def build(self, skip_corrupt: bool = False) -> list[dict]:
+        """
+        Scan the data directory and write the index (if index_path is set).
+        """
+        try:
+            records = self.scan(self.load(), skip_corrupt=skip_corrupt)
+            if self.index_path is not None:
+                self.save(records)
+            return records
+        except Exception as e:
+            raise MyException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index the raw audio dataset (headers only).")
+    parser.add_argument("--skip-corrupt", action="store_true",
+                        help="leave unreadable files out of the index instead of failing")
+    args = parser.parse_args()
+
+    DatasetIndexer().build(skip_corrupt=args.skip_corrupt)
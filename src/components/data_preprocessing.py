@@ -1,5 +1,6 @@
 import os
 import sys
+import argparse
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import LabelEncoder, StandardScaler
@@ -13,13 +14,13 @@ from src.constants import *
 from src.exception import MyException
 
 class DataPreprocessor:
-    def __init__(self, input_csv: str, output_dir: str, test_size=TEST_SIZE, random_state=RANDOM_STATE):
-        self.input_csv = input_csv
+    def __init__(self, input_path: str, output_dir: str, test_size=TEST_SIZE, random_state=RANDOM_STATE, export_csv=False):
+        self.input_path = input_path
+        self.export_csv = export_csv
         self.output_dir = output_dir
         self.test_size = test_size
         self.random_state = random_state
         self.artifact_dir = MODEL_DIR
-        os.makedirs(self.output_dir, exist_ok=True)
     
     def label_encode(self, y):
         """
@@ -31,26 +32,30 @@ class DataPreprocessor:
         y_encoded = label_encoder.fit_transform(y)
         return y_encoded, label_encoder
     
-    def preprocess(self, X):
+    def preprocess(self, X, preprocessor=None):
         """
-        scale features.
-        Returns processed DataFrame and fitted .
+        Scale features (float32, the feature store dtype).
+        Fits a new preprocessor unless a fitted one is given.
+        Returns processed DataFrame and the preprocessor.
         """
-  
-        preprocessor = ColumnTransformer(transformers=[
-            ('scaler', StandardScaler(), X.columns)
-        ], remainder='passthrough')
+        if preprocessor is None:
+            preprocessor = ColumnTransformer(transformers=[
+                ('scaler', StandardScaler(), X.columns)
+            ], remainder='passthrough')
+            X_scaled = preprocessor.fit_transform(X)
+        else:
+            X_scaled = preprocessor.transform(X)
+        df_processed = pd.DataFrame(np.asarray(X_scaled, dtype=np.float32), columns=X.columns, copy=False)
 
-        X_scaled = preprocessor.fit_transform(X)
-        df_processed = pd.DataFrame(X_scaled, columns=X.columns)
-       
         return df_processed, preprocessor
 
-    def initiate_data_preprocessing(self):
+    def split_and_transform(self, df):
+        """
+        Split a feature DataFrame, fit the scaler and label encoder on the
+        training split and apply them to both splits. All in memory.
+        Returns (train_df, test_df, preprocessor, label_encoder).
+        """
         try:
-            
-            df = load_dataframe(self.input_csv)
-
             X = df.drop('label', axis=1)
             y = df['label']
 
@@ -65,17 +70,28 @@ class DataPreprocessor:
             train_df['label'] = y_train_encoded
             
 
-            logging.info("Preprocessing testing data...")
-            
-            test_df,  _ = self.preprocess(X_test)  
-            test_df['label'] = label_encoder.transform(y_test)  
-            # Save processed CSVs
-            train_path = os.path.join(self.output_dir, 'train_data.csv')
-            test_path = os.path.join(self.output_dir, 'test_data.csv')
+            logging.info("Preprocessing testing data with the train-fitted preprocessor...")
+            test_df, _ = self.preprocess(X_test, preprocessor)
+            test_df['label'] = label_encoder.transform(y_test)
+            return train_df, test_df, preprocessor, label_encoder
+
+        except Exception as e:
+             raise MyException(e,sys)
+
+    def save(self, train_df, test_df, preprocessor, label_encoder):
+        """
+        Write the splits as feature stores and the fitted preprocessor and
+        label encoder as joblib artifacts (the DVC stage outputs).
+        """
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            # Save processed feature stores
+            train_path = os.path.join(self.output_dir, 'train_data.store')
+            test_path = os.path.join(self.output_dir, 'test_data.store')
 
            
-            save_dataframe(train_df, train_path)
-            save_dataframe(test_df, test_path)
+            save_dataframe(train_df, train_path, export_csv=self.export_csv, label_classes=label_encoder.classes_)
+            save_dataframe(test_df, test_path, export_csv=self.export_csv, label_classes=label_encoder.classes_)
 
 
             # # Save the label encoder and scaler
@@ -89,10 +105,22 @@ class DataPreprocessor:
         except Exception as e:
              raise MyException(e,sys)
 
+    def initiate_data_preprocessing(self):
+        try:
+            df = load_dataframe(self.input_path)
+            self.save(*self.split_and_transform(df))
+        except Exception as e:
+             raise MyException(e,sys)
+
 if __name__ == "__main__":
-    input_csv = FEATURES_CSV
+    parser = argparse.ArgumentParser(description="Split and scale extracted features.")
+    parser.add_argument("--export-csv", action="store_true",
+                        help="also write train_data.csv / test_data.csv")
+    args = parser.parse_args()
+
+    input_path = FEATURES_DATA
     output_dir = PREPROCESSED_DATA_DIR
     logging.info("Starting data preprocessing...")
-    preprocessor = DataPreprocessor(input_csv=input_csv, output_dir=output_dir)
+    preprocessor = DataPreprocessor(input_path=input_path, output_dir=output_dir, export_csv=args.export_csv)
     preprocessor.initiate_data_preprocessing()
     logging.info("Data preprocessing finished.")
\ No newline at end of file
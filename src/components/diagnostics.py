@@ -0,0 +1,199 @@
+# src/components/diagnostics.py
+
+import os
+import sys
+import json
+import time
+import tempfile
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import get_scorer, confusion_matrix
+from sklearn.model_selection import StratifiedKFold
+from src.logger import logging
+from src.exception import MyException
+from src.constants import (
+    DIAGNOSTICS_PATH, DIAGNOSTICS_CV, DIAGNOSTICS_TRAIN_SIZES, DIAGNOSTICS_N_JOBS, RANDOM_STATE
+)
+from src.components.model_evaluation import classification_metrics
+from src.utils.cv_utils import shared_matrix, stratified_order
+
+
+def _fit_fold(estimator, X, y, train_idx, test_idx, scorer, keep_predictions):
+    """
+    Fit on one (fold, training size) cell of the CV plan. Returns train and
+    test scores, the fit time and, for the full-size cell, the out-of-fold
+    predictions.
+    """
+    model = clone(estimator)
+    X_train, y_train = X[train_idx], y[train_idx]
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    X_test = X[test_idx]
+    test_score = scorer(model, X_test, y[test_idx])
+    train_score = scorer(model, X_train, y_train)
+    return train_score, test_score, fit_time, model.predict(X_test) if keep_predictions else None
+
+
+class TrainingDiagnostics:
+    """
+    One cross-validation plan from which the training diagnostics are derived.
+
+    The plan is DIAGNOSTICS_CV stratified folds x DIAGNOSTICS_TRAIN_SIZES
+    training sizes (class-stratified prefixes of each training fold), fitted
+    on a pool of at most n_jobs workers that share one memmapped copy of X.
+    joblib caps the BLAS/OpenMP threads of each worker, so the box is not
+    oversubscribed. Scores, fit times and the out-of-fold predictions of the
+    full-size fits are cached, then:
+
+        metrics()           CV metrics from the out-of-fold predictions, plus
+                            held-out metrics when test predictions are given
+        confusion_matrix()  from the held-out predictions if given, else
+                            from the out-of-fold ones
+        learning_curve()    train/validation scores per training size
+
+    none of which fits anything. timings() reports what each output cost:
+    the fits it needs plus the time to derive it.
+    """
+
+    def __init__(self, estimator, cv: int = DIAGNOSTICS_CV, train_sizes=DIAGNOSTICS_TRAIN_SIZES,
+                 scoring: str = "accuracy", n_jobs: int = DIAGNOSTICS_N_JOBS):
+        self.estimator = estimator
+        self.cv = cv
+        self.train_sizes = [float(size) for size in train_sizes]
+        if self.train_sizes[-1] != 1.0:
+            self.train_sizes.append(1.0)
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self._outputs = {}
+        self._derive_seconds = {}
+        self._render_seconds = {}
+
+    def run(self, X, y, y_test=None, y_test_pred=None):
+        """
+        Fit the CV plan on (X, y). y_test / y_test_pred are held-out labels
+        and the final model's predictions for them (e.g. from ModelEvaluator).
+        """
+        try:
+            self.y = np.asarray(y)
+            self.y_test = None if y_test is None else np.asarray(y_test)
+            self.y_test_pred = None if y_test_pred is None else np.asarray(y_test_pred)
+            scorer = get_scorer(self.scoring)
+
+            rng = np.random.default_rng(RANDOM_STATE)
+            folds = StratifiedKFold(n_splits=self.cv, shuffle=True, random_state=RANDOM_STATE)
+            folds = [(stratified_order(train_idx, self.y, rng), test_idx)
+                     for train_idx, test_idx in folds.split(np.zeros(len(self.y)), self.y)]
+            n_train = min(len(train_idx) for train_idx, _ in folds)
+            self.train_sizes_abs = [max(1, int(round(size * n_train))) for size in self.train_sizes]
+            cells = [(s, f) for s in range(len(self.train_sizes)) for f in range(self.cv)]
+            full = len(self.train_sizes) - 1
+
+            start = time.perf_counter()
+            with tempfile.TemporaryDirectory(prefix="accent-diagnostics-") as folder:
+                X_shared = shared_matrix(X, folder)
+                results = Parallel(n_jobs=self.n_jobs)(
+                    delayed(_fit_fold)(self.estimator, X_shared, self.y,
+                                       folds[f][0][:self.train_sizes_abs[s]], folds[f][1], scorer, s == full)
+                    for s, f in cells
+                )
+                del X_shared
+            self.fit_wall_seconds = time.perf_counter() - start
+
+            shape = (len(self.train_sizes), self.cv)
+            self.train_scores, self.test_scores, self.fit_times = (np.zeros(shape) for _ in range(3))
+            self.oof_pred = np.empty(len(self.y), dtype=self.y.dtype)
+            for (s, f), (train_score, test_score, fit_time, predictions) in zip(cells, results):
+                self.train_scores[s, f], self.test_scores[s, f], self.fit_times[s, f] = train_score, test_score, fit_time
+                if predictions is not None:
+                    self.oof_pred[folds[f][1]] = predictions
+
+            logging.info(f"Diagnostics: {len(cells)} fits ({self.cv} folds x {len(self.train_sizes)} sizes) "
+                         f"on {self.n_jobs} workers in {self.fit_wall_seconds:.2f}s")
+            return self
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def _derived(self, name, fn):
+        if name not in self._outputs:
+            start = time.perf_counter()
+            self._outputs[name] = fn()
+            self._derive_seconds[name] = time.perf_counter() - start
+        return self._outputs[name]
+
+    def timed(self, name, fn):
+        """
+        Run fn() (e.g. plotting an output) and count its time towards `name`.
+        """
+        start = time.perf_counter()
+        result = fn()
+        self._render_seconds[name] = self._render_seconds.get(name, 0.0) + time.perf_counter() - start
+        return result
+
+    def metrics(self) -> dict:
+        def derive():
+            metrics = {"cv": classification_metrics(self.y, self.oof_pred)}
+            if self.y_test is not None:
+                metrics["test"] = classification_metrics(self.y_test, self.y_test_pred)
+            return metrics
+        return self._derived("metrics", derive)
+
+    def confusion_matrix(self) -> np.ndarray:
+        def derive():
+            if self.y_test is not None:
+                return confusion_matrix(self.y_test, self.y_test_pred)
+            return confusion_matrix(self.y, self.oof_pred)
+        return self._derived("confusion_matrix", derive)
+
+    def learning_curve(self) -> dict:
+        def derive():
+            return {
+                "train_sizes": self.train_sizes_abs,
+                "train_scores": self.train_scores.tolist(),
+                "test_scores": self.test_scores.tolist(),
+                "train_mean": self.train_scores.mean(axis=1).round(4).tolist(),
+                "test_mean": self.test_scores.mean(axis=1).round(4).tolist(),
+                "test_std": self.test_scores.std(axis=1).round(4).tolist(),
+            }
+        return self._derived("learning_curve", derive)
+
+    def timings(self) -> dict:
+        """
+        Seconds spent per output: the summed fit time of the cells it needs
+        (the full-size cells for the CV metrics and the out-of-fold confusion
+        matrix, every cell for the learning curve), the time to derive it
+        from the cache and the time spent rendering it (see timed()).
+        """
+        full_fits = float(self.fit_times[-1].sum())
+        needs_fits = {
+            "metrics": full_fits,
+            "confusion_matrix": 0.0 if self.y_test is not None else full_fits,
+            "learning_curve": float(self.fit_times.sum()),
+        }
+        return {
+            "fit_wall_seconds": round(self.fit_wall_seconds, 4),
+            "n_fits": int(self.fit_times.size),
+            "outputs": {name: {"fit_seconds": round(needs_fits[name], 4),
+                               "derive_seconds": round(self._derive_seconds.get(name, 0.0), 6),
+                               "render_seconds": round(self._render_seconds.get(name, 0.0), 4)}
+                        for name in needs_fits},
+        }
+
+    def save_report(self, path: str = DIAGNOSTICS_PATH) -> dict:
+        report = {
+            "estimator": type(self.estimator).__name__,
+            "cv": self.cv,
+            "scoring": self.scoring,
+            "n_jobs": self.n_jobs,
+            "metrics": self.metrics(),
+            "confusion_matrix": self.confusion_matrix().tolist(),
+            "learning_curve": self.learning_curve(),
+        }
+        report["timings"] = self.timings()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        logging.info(f"Diagnostics report written to {path}")
+        return report
@@ -1,16 +1,27 @@
 # src/components/feature_extraction.py
 
 import numpy as np
-import pandas as pd
 import librosa
 import os
+import shutil
+import hashlib
+import argparse
+import scipy.fft
 from tqdm import tqdm
 from src.logger import logging
 from src.constants import *
-from src.utils.main_utils import save_dataframe
+from src.utils.feature_store import (
+    FeatureStoreWriter, read_feature_arrays, read_schema, is_feature_store, export_feature_store_csv
+)
+from src.utils.extraction_manifest import ExtractionManifest, config_digest
+from src.components.data_indexing import DatasetIndexer
+from src.utils.feature_cache import FeatureCache
 from src.components.data_augmentation import DataAugmentor
+from src.components.audio_ingestion import AudioIngestor
 from src.exception import MyException
 import sys 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 class FeatureExtractor:
     def __init__(self, sr=SAMPLE_RATE):
@@ -19,72 +30,650 @@ class FeatureExtractor:
         self.hop_length = HOP_LENGTH
         self.n_mfcc = MFCC_COUNT
         self.duration = DURATION 
+        # Periodic Hann window, identical to scipy.signal.get_window("hann", n, fftbins=True)
+        # without paying for the scipy.signal import
+        self._window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(self.frame_length) / self.frame_length)).astype(np.float32)
+        self._mel_basis = librosa.filters.mel(sr=self.sr, n_fft=self.frame_length)
+        self.ingestor = AudioIngestor()
         logging.info(f"[INIT] FeatureExtractorFromCSV initialized.")
 
+    def _frame(self, Y):
+        """
+        Centre-pad a (n_clips, n_samples) batch with zeros and return a strided
+        (n_clips, n_frames, frame_length) view. This is the single framing pass
+        shared by the power spectrum and the RMS energy.
+        """
+        pad = self.frame_length // 2
+        Y_padded = np.pad(Y, [(0, 0), (pad, pad)], mode="constant")
+        frames = np.lib.stride_tricks.sliding_window_view(Y_padded, self.frame_length, axis=-1)
+        return frames[:, ::self.hop_length]
+
+    def _zero_crossing_rate(self, Y, n_frames):
+        """
+        Per-frame zero crossing rate computed from one sign pass over the batch.
+        Matches librosa.feature.zero_crossing_rate (edge padding, threshold 1e-10).
+        """
+        n = Y.shape[-1]
+        pad = self.frame_length // 2
+        signs = np.signbit(np.where(np.abs(Y) <= 1e-10, 0, Y))
+        crossings = signs[:, 1:] != signs[:, :-1]
+
+        # counts[:, k] = crossings between samples (t-1, t) for 1 <= t <= k
+        counts = np.zeros((Y.shape[0], max(n, 1)), dtype=np.int64)
+        np.cumsum(crossings, axis=1, out=counts[:, 1:])
+
+        starts = np.arange(n_frames) * self.hop_length - pad
+        lo = np.clip(starts + 1, 1, None)
+        hi = np.clip(starts + self.frame_length - 1, None, n - 1)
+        valid = hi >= lo
+        lo, hi = np.where(valid, lo, 1), np.where(valid, hi, 1)
+
+        per_frame = np.where(valid, counts[:, hi] - counts[:, lo - 1], 0)
+        return per_frame / self.frame_length
+
+    def extract_features_batch(self, Y):
+        """
+        Fused MFCC + ZCR + RMSE kernel.
+
+        Frames the batch once and computes one power spectrum; MFCC and RMSE are
+        derived from those shared buffers. Accepts a 2-D array of equal-length
+        clips (e.g. DataAugmentor._pad_or_trim output) and returns an
+        (n_clips, MFCC_COUNT + 2) matrix in the same column layout as
+        extract_features.
+        """
+        try:
+            Y = np.atleast_2d(np.asarray(Y, dtype=np.float32))
+            frames = self._frame(Y)
+            n_frames = frames.shape[1]
+
+            # Power spectrum -> mel -> dB -> DCT (librosa.feature.mfcc equivalent)
+            spectrum = scipy.fft.rfft(frames * self._window, axis=-1)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
+            mel = power @ self._mel_basis.T
+            log_mel = 10.0 * np.log10(np.maximum(mel, 1e-10))
+            log_mel = np.maximum(log_mel, log_mel.max(axis=(1, 2), keepdims=True) - 80.0)
+            mfccs = scipy.fft.dct(log_mel, type=2, norm="ortho", axis=-1)[..., :self.n_mfcc]
+
+            rmse = np.sqrt(np.mean(frames ** 2, axis=-1))
+            zcr = self._zero_crossing_rate(Y, n_frames)
+
+            features = np.empty((Y.shape[0], self.n_mfcc + 2), dtype=np.float64)
+            features[:, :self.n_mfcc] = np.mean(mfccs, axis=1)
+            features[:, self.n_mfcc] = np.mean(zcr, axis=1)
+            features[:, self.n_mfcc + 1] = np.mean(rmse, axis=1)
+            return features
+        except Exception as e:
+            raise MyException(e, sys)
+
     def extract_features(self, y):
-        mfccs = librosa.feature.mfcc(y=y, sr=self.sr, n_mfcc=self.n_mfcc,
-                                     hop_length=self.hop_length, n_fft=self.frame_length)
-        zcr = librosa.feature.zero_crossing_rate(y, frame_length=self.frame_length,
-                                                 hop_length=self.hop_length)[0]
-        rmse = librosa.feature.rms(y=y, frame_length=self.frame_length,
-                                   hop_length=self.hop_length)[0]
-
-        mfccs_mean = np.mean(mfccs, axis=1)
-        zcr_mean = np.mean(zcr)
-        rmse_mean = np.mean(rmse)
-
-        return list(mfccs_mean) + [zcr_mean, rmse_mean]
-
- 
-    def initiate_featur_extraction_pipeline(self, data_dir, output_csv_path):
-        features_list = []
-        labels = []
-        
+        return list(self.extract_features_batch(np.asarray(y)[np.newaxis])[0])
+
+    def n_frames(self, n_samples):
+        """
+        Number of (centred) frames the kernel produces for a clip of n_samples.
+        """
+        return 1 + n_samples // self.hop_length
+
+    def _stack_features(self, Y, seeds, augmentor):
+        """
+        Feature rows of shape (clips, 1 + variants, features) for a stack of
+        equal-length clips: the originals and every augmented variant.
+        """
+        augmented = augmentor.augment_batch(Y, seeds)
+        stack = np.concatenate([Y[:, np.newaxis], augmented], axis=1)
+        features = self.extract_features_batch(stack.reshape(-1, stack.shape[-1]))
+        return features.reshape(len(Y), stack.shape[1], -1)
+
+    def process_files(self, file_paths, augmentor):
+        """
+        Decode a group of clips, augment them as one stack and return, per
+        file, (feature rows for the original + every augmented variant, None)
+        or (None, error) if that file could not be processed. If the stack
+        fails as a whole, its clips are retried one by one so the error lands
+        on the file that caused it.
+        """
+        clips, seeds, results = [], [], []
+        for file_path in file_paths:
+            try:
+                clips.append(augmentor._pad_or_trim(self.ingestor.load(file_path, self.sr, self.duration)))
+                seeds.append(augmentor.clip_seed(file_path))
+                results.append(None)
+            except Exception as e:
+                results.append(repr(e))
+        if not clips:
+            return [(None, error) for error in results]
+
+        try:
+            computed = [(rows, None) for rows in self._stack_features(np.stack(clips), seeds, augmentor)]
+        except Exception as e:
+            if len(clips) == 1:
+                computed = [(None, repr(e))]
+            else:
+                logging.warning(f"Stack of {len(clips)} clips failed ({e!r}); retrying file by file")
+                computed = []
+                for clip, seed in zip(clips, seeds):
+                    try:
+                        computed.append((self._stack_features(clip[np.newaxis], [seed], augmentor)[0], None))
+                    except Exception as clip_error:
+                        computed.append((None, repr(clip_error)))
+
+        computed = iter(computed)
+        return [next(computed) if error is None else (None, error) for error in results]
+
+    def process_file(self, file_path, augmentor):
+        """
+        Feature rows for the original + augmented versions of one clip.
+        """
+        features, error = self.process_files([file_path], augmentor)[0]
+        if error is not None:
+            raise ValueError(error)
+        return features
+
+    @staticmethod
+    def _work_units(index, data_dir):
+        """
+        (file_path, label) pairs in the canonical row order (index order, see row_order_key).
+        """
+        return [(os.path.join(data_dir, record["path"]), record["label"]) for record in index]
+
+    def _cached(self, chunk, feature_cache, cache_config):
+        """
+        Cache keys and cached feature blocks (None on a miss) for a chunk.
+        """
+        if feature_cache is None:
+            return [None] * len(chunk), [None] * len(chunk)
+        keys = [feature_cache.make_key(feature_cache.hash_file(path), cache_config) for path, _ in chunk]
+        return keys, [feature_cache.get(key) for key in keys]
+
+    def _iter_features(self, work_units, n_jobs, chunk_size, augmentor, feature_cache=None):
+        """
+        Generator over (file_path, label, features) in work-unit order;
+        features is None for a file that failed.
+
+        Work goes out in chunks of chunk_size files. Cache hits are resolved
+        here; the misses of a chunk are decoded, augmented and extracted as
+        one stack, in-process or on a worker. In parallel mode at most
+        2 * n_jobs chunks are in flight and results are consumed oldest
+        first, so memory stays bounded by that window.
+        """
+        cache_config = {**self.config(), **augmentor.config(),
+                        "variants": ["original"] + augmentor.variant_names()}
+        chunks = [work_units[i:i + chunk_size] for i in range(0, len(work_units), chunk_size)]
+        n_cached = 0
+
+        def finish(chunk, keys, cached, computed):
+            nonlocal n_cached
+            computed = iter(computed)
+            for (file_path, label), key, features in zip(chunk, keys, cached):
+                if features is not None:
+                    n_cached += 1
+                    yield file_path, label, features
+                    continue
+                features, error = next(computed)
+                if error is not None:
+                    logging.warning(f"[SKIP] {file_path}: {error}")
+                elif key is not None:
+                    feature_cache.put(key, features)
+                yield file_path, label, features
+
+        with tqdm(total=len(work_units), desc="🔊 Augmenting") as progress:
+            if n_jobs <= 1:
+                for chunk in chunks:
+                    keys, cached = self._cached(chunk, feature_cache, cache_config)
+                    pending = [path for (path, _), hit in zip(chunk, cached) if hit is None]
+                    computed = self.process_files(pending, augmentor) if pending else []
+                    yield from finish(chunk, keys, cached, computed)
+                    progress.update(len(chunk))
+                self.ingestor.log_timings()
+            else:
+                worker_progress = {}
+                worker_timings = {}
+                in_flight = deque()
+                with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                         initargs=(self.sr, self.duration, augmentor.recipe)) as executor:
+                    chunk_iter = iter(enumerate(chunks))
+                    while True:
+                        while len(in_flight) < 2 * n_jobs:
+                            item = next(chunk_iter, None)
+                            if item is None:
+                                break
+                            idx, chunk = item
+                            keys, cached = self._cached(chunk, feature_cache, cache_config)
+                            pending = [path for (path, _), hit in zip(chunk, cached) if hit is None]
+                            future = executor.submit(_extract_chunk, pending) if pending else None
+                            in_flight.append((idx, chunk, keys, cached, future))
+                        if not in_flight:
+                            break
+
+                        idx, chunk, keys, cached, future = in_flight.popleft()
+                        computed = []
+                        if future is not None:
+                            pid, computed, timings = future.result()
+                            worker_timings[pid] = timings
+                            worker_progress[pid] = worker_progress.get(pid, 0) + len(computed)
+                            logging.info(f"[worker {pid}] chunk {idx + 1}/{len(chunks)} done "
+                                         f"({worker_progress[pid]} files processed by this worker)")
+                        yield from finish(chunk, keys, cached, computed)
+                        progress.set_postfix(workers=len(worker_progress))
+                        progress.update(len(chunk))
+
+                totals = {key: round(sum(t[key] for t in worker_timings.values()), 4)
+                          for key in AudioIngestor().timings()}
+                logging.info(f"Audio ingestion timings (all workers): {totals}")
+
+        if feature_cache is not None:
+            logging.info(f"{n_cached} of {len(work_units)} files served from cache")
+            feature_cache.log_stats()
+
+    def columns(self):
+        return [f"mfcc_{i+1}" for i in range(self.n_mfcc)] + ["zcr", "rmse"]
+
+    def extract_arrays(self, data_dir, index=None, n_jobs=FEATURE_N_JOBS, chunk_size=FEATURE_CHUNK_SIZE,
+                       feature_cache=None):
+        """
+        In-memory counterpart of initiate_featur_extraction_pipeline: returns
+        the float32 feature matrix (rows in index order, columns()) and the
+        label of every row, exactly as the feature store would hold them.
+        """
+        try:
+            if index is None:
+                index = DatasetIndexer(data_dir, index_path=None).scan()
+            augmentor = DataAugmentor(self.sr, self.duration)
+            n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+
+            blocks, labels = [], []
+            for _, label, features in self._iter_features(self._work_units(index, data_dir), n_jobs, chunk_size,
+                                                          augmentor, feature_cache):
+                if features is not None:
+                    blocks.append(np.asarray(features, dtype=np.float32))
+                    labels += [label] * len(features)
+            X = np.concatenate(blocks) if blocks else np.empty((0, len(self.columns())), dtype=np.float32)
+            return X, np.asarray(labels, dtype=object)
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def config(self):
+        """
+        Settings that determine the extracted features (used for cache keys).
+        """
+        return {
+            "sample_rate": self.sr,
+            "duration": self.duration,
+            "frame_length": self.frame_length,
+            "hop_length": self.hop_length,
+            "n_mfcc": self.n_mfcc,
+        }
+
+    def initiate_featur_extraction_pipeline(self, data_dir, output_path,
+                                            n_jobs=FEATURE_N_JOBS, chunk_size=FEATURE_CHUNK_SIZE,
+                                            feature_cache=None, export_csv=False, resume=True, index=None,
+                                            shard_index=None, num_shards=1):
+        """
+        Extract features for every clip in the dataset index (see
+        DatasetIndexer); without one, data_dir is scanned first, which fails
+        fast if any file header is unreadable.
+
+        With num_shards > 1 only the clips of shard shard_index (see shard_of)
+        are processed, into a store of their own; merge_feature_shards then
+        combines the shards into the store a single run would have written.
+
+        The stage is a streaming pipeline: decode -> pad/trim -> augment ->
+        extract -> append. Feature rows are appended to the output store in
+        chunks of FEATURE_WRITE_CHUNK_ROWS as they are produced, so memory
+        does not grow with the dataset and the rows written before a crash
+        stay readable (the store's schema is marked complete only at the
+        end).
+
+        The store keeps a manifest (see ExtractionManifest) of every source
+        file's hash, config and row range. With resume, a rerun only
+        processes files that are new, changed or were not flushed before an
+        interruption; rows of deleted or changed files are dropped. The
+        final store is always in canonical order, identical to a fresh run.
+
+        With n_jobs > 1 (or -1 for all cores) work units of chunk_size files
+        are fanned out to a process pool, longest clips first so the slow
+        chunks do not end up last. Rows are compacted into the canonical
+        order at the end, so the output matches the serial run row for row.
+        A file that fails is logged and skipped without aborting the run. Each
+        chunk is augmented as one stack using the recipe from params.yaml.
+
+        When a FeatureCache is given, clips whose content and config are
+        unchanged are served from the cache and never decoded.
+        """
         logging.info("Starting feature extraction from samples...")
-        da = DataAugmentor(self.sr, self.duration) 
+
+        all_columns = self.columns()
+        label_classes = sorted(set(LABELS.values()))
+
         try:
-            for i in tqdm(range(NUM_FILES), desc="🔊 Augmenting"):
-                for accent, label in LABELS.items():
-                    file_path = os.path.join(data_dir, f"{accent}/{accent}_{i}.wav")
-
-                    if not os.path.exists(file_path):
-                        logging.warning(f"[SKIP] File not found: {file_path}")
-                        continue
-
-                    y, sr = librosa.load(file_path, sr=self.sr, duration=self.duration)
-                    
-                    y = da._pad_or_trim(y)
-                  
-                    augmented = da.augment_one(y)
-
-                    if len(augmented) != 3:
-                        logging.warning(f"[SKIP] Augmentation failed: {file_path}")
-                        continue
-
-                    # Original + 3 augmented versions
-                    for aug in [y] + augmented:
-                        features = self.extract_features(aug)
-                        features_list.append(features)
-                        labels.append(label)
+            if index is None:
+                index = DatasetIndexer(data_dir, index_path=None).scan()
+            shard = None
+            if num_shards > 1:
+                if shard_index is None or not 0 <= shard_index < num_shards:
+                    raise ValueError(f"shard_index must be in [0, {num_shards}), got {shard_index}")
+                if output_path.endswith(".csv"):
+                    raise ValueError("Sharded extraction needs a feature store output, not a CSV")
+                shard = {"index": shard_index, "num_shards": num_shards}
+                index = [record for record in index if shard_of(record["path"], num_shards) == shard_index]
+                logging.info(f"Shard {shard_index} of {num_shards}: {len(index)} clips")
+            work_units = self._work_units(index, data_dir)
+            augmentor = DataAugmentor(self.sr, self.duration)
+            n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+            if n_jobs > 1:
+                logging.info(f"Running feature extraction with {n_jobs} workers "
+                             f"(chunk size {chunk_size})")
+
+            if output_path.endswith(".csv"):
+                with FeatureStoreWriter(None, all_columns, label_classes=label_classes,
+                                        csv_path=output_path) as writer:
+                    for _, label, features in self._iter_features(work_units, n_jobs, chunk_size,
+                                                                  augmentor, feature_cache):
+                        if features is not None:
+                            writer.append(features, [label] * len(features))
+                logging.info(f"Feature extraction complete → {output_path} ({writer.n_rows} rows)")
+                return
+
+            config = config_digest({**self.config(), **augmentor.config(),
+                                    "variants": ["original"] + augmentor.variant_names()})
+            keys = [record["path"] for record in index]
+            durations = {record["path"]: min(record["duration"], self.duration) for record in index}
+
+            manifest = ExtractionManifest.load(output_path) if resume else ExtractionManifest(output_path)
+            n_stored = 0
+            if resume and is_feature_store(output_path):
+                schema = read_schema(output_path)
+                if schema["columns"] == all_columns and (schema["label"] or {}).get("classes") == label_classes:
+                    n_stored = schema["n_rows"]
+                else:
+                    manifest = ExtractionManifest(output_path)
+
+            # Which files already have valid rows in the store?
+            sources, current, pending = {}, {}, []
+            for record, (file_path, label) in zip(index, work_units):
+                key = record["path"]
+                sources[key] = {"hash": record["hash"], "size": record["size"], "mtime_ns": record["mtime_ns"]}
+                entry = manifest.current_entry(key, sources[key], label, config, n_stored)
+                if entry is not None:
+                    current[key] = entry
+                else:
+                    pending.append((file_path, label))
+            dropped = len(set(manifest.files) - set(current))
+            logging.info(f"Manifest: {len(current)} files up to date, {len(pending)} to process, "
+                         f"{dropped} stale entries dropped")
+            manifest.files = current
+            manifest.failed = []
+            manifest.shard = shard
+            if n_jobs > 1:
+                # Longest first (stable), the store is put back in canonical order afterwards
+                pending.sort(key=lambda unit: -durations[os.path.relpath(unit[0], data_dir)])
+
+            if pending or not manifest.files or n_stored == 0:
+                manifest.save()
+                with FeatureStoreWriter(output_path, all_columns, label_classes=label_classes,
+                                        append=bool(current)) as writer:
+                    unflushed = []
+                    for file_path, label, features in self._iter_features(pending, n_jobs, chunk_size,
+                                                                          augmentor, feature_cache):
+                        key = os.path.relpath(file_path, data_dir)
+                        if features is None:
+                            manifest.failed.append(key)
+                            continue
+                        offset = writer.n_rows + writer.n_pending
+                        unflushed.append((key, {"label": label, **sources[key], "config": config,
+                                                "offset": offset, "n_rows": len(features)}))
+                        flushed_before = writer.n_rows
+                        writer.append(features, [label] * len(features))
+                        if writer.n_rows != flushed_before:
+                            manifest.files.update(unflushed)
+                            unflushed = []
+                            manifest.save()
+                    writer.flush()
+                    manifest.files.update(unflushed)
+                    manifest.failed.sort()
+                    manifest.save()
+                n_stored = writer.n_rows
+
+            self._finalize_store(output_path, manifest, keys, n_stored, all_columns, label_classes)
+
+            if export_csv:
+                export_feature_store_csv(output_path, os.path.splitext(output_path)[0] + ".csv")
 
         except Exception as e:
             raise MyException(e,sys)
 
-        mfcc_columns = [f"mfcc_{i+1}" for i in range(self.n_mfcc)]
-        all_columns = mfcc_columns + ["zcr", "rmse"]
+        logging.info(f"Feature extraction complete → {output_path} ({read_schema(output_path)['n_rows']} rows)")
+
+    def _finalize_store(self, store_path, manifest, keys, n_stored, columns, label_classes):
+        """
+        Rewrite the store in canonical (work-unit) order if appends or
+        dropped files left it out of order, and mark it complete.
+        """
+        offset, canonical = 0, True
+        for key in keys:
+            entry = manifest.files.get(key)
+            if entry is None:
+                continue
+            canonical &= entry["offset"] == offset
+            offset += entry["n_rows"]
+        if canonical and offset == n_stored:
+            manifest.files = {key: manifest.files[key] for key in keys if key in manifest.files}
+            manifest.save()
+            FeatureStoreWriter(store_path, columns, label_classes=label_classes, append=True).close()
+            return
+
+        logging.info(f"Compacting {store_path} into canonical order ({offset} of {n_stored} rows kept)")
+        X, y, schema = read_feature_arrays(store_path)
+        classes = np.asarray(schema["label"]["classes"], dtype=object)
+        sources = {key: (X, y, classes, manifest.files[key]) for key in keys if key in manifest.files}
+        _assemble_store(store_path, keys, sources, columns, label_classes, manifest.failed, manifest.shard)
+        del X, y, sources
+
+
+def _assemble_store(store_path, keys, sources, columns, label_classes, failed, shard=None):
+    """
+    Write a complete store (and its manifest) holding, in `keys` order, the
+    rows of every key in sources (key -> (X, y, classes, manifest entry)).
+    It is built next to store_path and swapped in at the end.
+    """
+    tmp_path = store_path.rstrip(os.sep) + ".assemble"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+
+    assembled = ExtractionManifest(tmp_path, failed=sorted(failed), shard=shard)
+    with FeatureStoreWriter(tmp_path, columns, label_classes=label_classes) as writer:
+        for key in keys:
+            if key not in sources:
+                continue
+            X, y, classes, entry = sources[key]
+            rows = slice(entry["offset"], entry["offset"] + entry["n_rows"])
+            assembled.files[key] = {**entry, "offset": writer.n_rows + writer.n_pending}
+            writer.append(np.asarray(X[rows]), classes[y[rows]])
+    assembled.save()
+
+    backup = store_path.rstrip(os.sep) + ".old"
+    shutil.rmtree(backup, ignore_errors=True)
+    if os.path.exists(store_path):
+        os.replace(store_path, backup)
+    os.replace(tmp_path, store_path)
+    shutil.rmtree(backup, ignore_errors=True)
+
+
+# ---------------------------------------------------------------------------
+# Sharding
+
+def shard_of(key, num_shards):
+    """
+    Shard of a source file, from a SHA-256 of its path relative to the data
+    directory: stable across machines, runs and Python processes.
+    """
+    digest = hashlib.sha256(key.replace(os.sep, "/").encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % num_shards
+
+
+def shard_store_path(output_path, shard_index, num_shards):
+    """features.store -> features.shard-00-of-04.store"""
+    root, ext = os.path.splitext(output_path.rstrip(os.sep))
+    return f"{root}.shard-{shard_index:02d}-of-{num_shards:02d}{ext}"
+
+
+def merge_feature_shards(output_path, num_shards, index, export_csv=False):
+    """
+    Combine the shard stores of output_path into output_path itself.
 
-        final_df = pd.DataFrame(features_list, columns=all_columns)
-        final_df["label"] = labels
+    Every shard must be complete, written for this shard layout and agree
+    with the others on columns, labels and extraction config; every clip of
+    the index must be in the shard it hashes to (as rows or as a recorded
+    failure), with the content hash the index has for it; and each shard's
+    rows must be in canonical order. Rows are then written in index order,
+    so the result is byte-identical to a single-node run over the same index.
+    """
+    try:
+        keys = [record["path"] for record in index]
+        expected = [{} for _ in range(num_shards)]
+        for record in index:
+            expected[shard_of(record["path"], num_shards)][record["path"]] = record
 
-        save_dataframe(final_df, output_csv_path)
-        logging.info(f"Feature extraction complete → {output_csv_path}")
+        sources, failed, layout, configs = {}, [], None, set()
+        for shard_index in range(num_shards):
+            path = shard_store_path(output_path, shard_index, num_shards)
+            if not is_feature_store(path):
+                raise ValueError(f"Shard {path} is missing")
+            schema = read_schema(path)
+            manifest = ExtractionManifest.load(path)
+            if not schema.get("complete", True):
+                raise ValueError(f"Shard {path} is incomplete (extraction did not finish)")
+            if manifest.shard != {"index": shard_index, "num_shards": num_shards}:
+                raise ValueError(f"{path} holds shard {manifest.shard}, not {shard_index} of {num_shards}")
+
+            configs |= {entry["config"] for entry in manifest.files.values()}
+            shard_layout = (schema["columns"], (schema["label"] or {}).get("classes"))
+            layout = layout or shard_layout
+            if shard_layout != layout or len(configs) > 1:
+                raise ValueError(f"Shard {path} was extracted with different columns, labels or config")
+
+            shard_keys = set(manifest.files) | set(manifest.failed)
+            missing = set(expected[shard_index]) - shard_keys
+            extra = shard_keys - set(expected[shard_index])
+            if missing or extra:
+                raise ValueError(f"Shard {path} does not match the dataset index: "
+                                 f"{len(missing)} clip(s) missing, {len(extra)} unexpected")
+            stale = [key for key, entry in manifest.files.items()
+                     if entry["hash"] != expected[shard_index][key]["hash"]]
+            if stale:
+                raise ValueError(f"Shard {path} is stale for {len(stale)} clip(s), e.g. {stale[0]}")
+
+            offset = 0
+            for key in keys:
+                entry = manifest.files.get(key)
+                if entry is None:
+                    continue
+                if entry["offset"] != offset:
+                    raise ValueError(f"Shard {path} rows are not in canonical order at {key}")
+                offset += entry["n_rows"]
+            if offset != schema["n_rows"]:
+                raise ValueError(f"Shard {path} has {schema['n_rows']} rows, its manifest covers {offset}")
+
+            X, y, _ = read_feature_arrays(path)
+            classes = np.asarray(schema["label"]["classes"], dtype=object)
+            sources.update({key: (X, y, classes, entry) for key, entry in manifest.files.items()})
+            failed += manifest.failed
+
+        columns, label_classes = layout
+        _assemble_store(output_path, keys, sources, columns, label_classes, failed)
+        del sources
+        logging.info(f"Merged {num_shards} shards → {output_path} ({read_schema(output_path)['n_rows']} rows, "
+                     f"{len(failed)} failed clips)")
+
+        if export_csv:
+            export_feature_store_csv(output_path, os.path.splitext(output_path)[0] + ".csv")
+    except Exception as e:
+        raise MyException(e, sys)
+
+
+class RunningFeatureMean:
+    """
+    Incremental, frame-weighted running mean of the per-clip feature vector
+    (MFCC means, ZCR, RMSE). Each window contributes its mean features weighted
+    by its frame count, so the state is O(n_features) however long the input is.
+    """
+
+    def __init__(self, n_features=MFCC_COUNT + 2):
+        self.mean = np.zeros(n_features, dtype=np.float64)
+        self.n_frames = 0
+
+    def update(self, features, n_frames):
+        self.n_frames += n_frames
+        self.mean += (np.asarray(features, dtype=np.float64) - self.mean) * (n_frames / self.n_frames)
+        return self.mean
+
+
+# ---------------------------------------------------------------------------
+# Process-pool workers
+
+_worker_extractor = None
+_worker_augmentor = None
+
+
+def _init_worker(sr, duration, recipe):
+    global _worker_extractor, _worker_augmentor
+    _worker_extractor = FeatureExtractor(sr)
+    _worker_augmentor = DataAugmentor(sr, duration, recipe)
+
+
+def _extract_chunk(file_paths):
+    """
+    Process a chunk of files inside a worker. Failures are returned per file
+    instead of raised, so one bad clip never takes down the chunk.
+    """
+    try:
+        results = _worker_extractor.process_files(file_paths, _worker_augmentor)
+    except Exception as e:
+        results = [(None, repr(e))] * len(file_paths)
+    return os.getpid(), results, _worker_extractor.ingestor.timings()
 
 
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract audio features for training.")
+    parser.add_argument("--n-jobs", type=int, default=FEATURE_N_JOBS,
+                        help="worker processes (1 = serial, -1 = all cores)")
+    parser.add_argument("--chunk-size", type=int, default=FEATURE_CHUNK_SIZE,
+                        help="files per work unit (augmented as one stack)")
+    parser.add_argument("--export-csv", action="store_true",
+                        help="also write features.csv next to the feature store")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore the content-addressed feature cache")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="rebuild the feature store from scratch instead of updating it")
+    parser.add_argument("--num-shards", type=int, default=1,
+                        help="split the dataset into this many shards (one per node)")
+    parser.add_argument("--shard-index", type=int, default=None,
+                        help="extract only this shard (0-based) into its own store")
+    parser.add_argument("--merge", action="store_true",
+                        help="merge the --num-shards shard stores into the feature store")
+    args = parser.parse_args()
+
+    indexer = DatasetIndexer()
+    index = indexer.load()
+    if index is None:
+        index = indexer.build()
+
+    if args.merge:
+        merge_feature_shards(FEATURES_DATA, args.num_shards, index, export_csv=args.export_csv)
+        sys.exit(0)
+
+    sharded = args.shard_index is not None
     extractor = FeatureExtractor()
     extractor.initiate_featur_extraction_pipeline(
         data_dir=RAW_DATA_DIR,
-        output_csv_path=os.path.join(INTERIM_DATA_DIR, "features.csv")
+        index=index,
+        output_path=shard_store_path(FEATURES_DATA, args.shard_index, args.num_shards) if sharded else FEATURES_DATA,
+        export_csv=args.export_csv and not sharded,
+        n_jobs=args.n_jobs,
+        chunk_size=args.chunk_size,
+        feature_cache=None if args.no_cache else FeatureCache(),
+        resume=not args.no_resume,
+        shard_index=args.shard_index,
+        num_shards=args.num_shards if sharded else 1
     )
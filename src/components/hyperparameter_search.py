@@ -0,0 +1,221 @@
+# src/components/hyperparameter_search.py
+
+import os
+import sys
+import json
+import math
+import time
+import tempfile
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from src.logger import logging
+from src.exception import MyException
+from src.constants import SEARCH_CONFIG, SEARCH_RESULTS_PATH, RANDOM_STATE
+from src.utils.cv_utils import shared_matrix, stratified_order
+
+
+def load_search_config(params: dict) -> dict:
+    """
+    The `model_training.search` section of params.yaml merged over SEARCH_CONFIG.
+    """
+    return {**SEARCH_CONFIG, **((params.get("model_training") or {}).get("search") or {})}
+
+
+def _growth_param(estimator):
+    """
+    The parameter along which warm_start only appends ensemble members, so a
+    warm-started fit gives the same model as a fit from scratch:
+    n_estimators for forests and gradient boosting, max_iter for histogram
+    gradient boosting without early stopping. None for everything else
+    (linear models, MLPs, ...), where warm start would carry the previous
+    candidate's solution into the next one.
+    """
+    params = estimator.get_params()
+    if "warm_start" not in params or not type(estimator).__module__.startswith("sklearn.ensemble"):
+        return None
+    if "n_estimators" in params:
+        return "n_estimators"
+    if "max_iter" in params and params.get("early_stopping") is False:
+        return "max_iter"
+    return None
+
+
+def _warm_start_chains(estimator, candidates):
+    """
+    Split candidate indices into chains fitted one after the other on the
+    same estimator with warm_start=True.
+
+    A chain holds candidates that differ only in the growth parameter (see
+    _growth_param), in increasing order. Every other candidate is its own
+    chain and is fitted from a fresh clone.
+    """
+    growth = _growth_param(estimator)
+    if growth is None:
+        return [[i] for i in range(len(candidates))]
+
+    default = estimator.get_params()[growth]
+    groups = {}
+    for i, candidate in enumerate(candidates):
+        rest = tuple(sorted((k, repr(v)) for k, v in candidate.items() if k != growth))
+        groups.setdefault(rest, []).append(i)
+    return [sorted(group, key=lambda i: candidates[i].get(growth, default)) for group in groups.values()]
+
+
+def _fit_chain(estimator, candidates, X, y, train_idx, test_idx, scorer):
+    """
+    Fit and score a warm-start chain of candidates on one fold.
+    Returns [(score, fit_seconds, score_seconds)] in chain order.
+    """
+    X_train, y_train = X[train_idx], y[train_idx]
+    X_test, y_test = X[test_idx], y[test_idx]
+    model = clone(estimator)
+    if len(candidates) > 1:
+        model.set_params(warm_start=True)
+
+    results = []
+    for candidate in candidates:
+        model.set_params(**candidate)
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+        start = time.perf_counter()
+        score = scorer(model, X_test, y_test)
+        results.append((float(score), fit_time, time.perf_counter() - start))
+    return results
+
+
+class HyperparameterSearch:
+    """
+    Grid or successive-halving search over a params.yaml search space.
+
+    Every round evaluates the remaining candidates with stratified k-fold
+    CV; one task per (fold, chain) runs on a joblib process pool, where a
+    chain is a single candidate or a warm-start chain of ensemble sizes.
+    The training matrix is written once as a memmap and shared by all
+    workers. Halving uses n_rows training rows per fold in each round,
+    multiplying n_rows and dividing the candidates by `factor` until the
+    last round runs on the full folds.
+    """
+
+    def __init__(self, estimator, config: dict, results_path: str = SEARCH_RESULTS_PATH):
+        self.estimator = estimator
+        self.config = {**SEARCH_CONFIG, **config}
+        self.results_path = results_path
+        if self.config["strategy"] not in ("halving", "grid"):
+            raise ValueError(f"Unknown search strategy: {self.config['strategy']}")
+        self.candidates = list(ParameterGrid({k: list(v) for k, v in self.config["space"].items()}))
+        if not self.candidates or not self.config["space"]:
+            raise ValueError("The search space in params.yaml is empty")
+
+    def _schedule(self, n_rows_max, n_classes):
+        """
+        Training rows per fold for each round.
+        """
+        if self.config["strategy"] == "grid":
+            return [n_rows_max]
+        factor = self.config["factor"]
+        n_rounds = 1 + int(math.floor(math.log(len(self.candidates), factor) + 1e-9))
+        min_rows = self.config["min_resources"] or max(2 * n_classes, n_rows_max // factor ** (n_rounds - 1))
+        n_rounds = min(n_rounds, 1 + int(math.floor(math.log(max(n_rows_max / min_rows, 1), factor) + 1e-9)))
+        return [min(n_rows_max, int(min_rows * factor ** r)) for r in range(n_rounds - 1)] + [n_rows_max]
+
+    def run(self, X, y) -> dict:
+        """
+        Search, write the results report and return the best parameters.
+        """
+        try:
+            y = np.asarray(y)
+            cv = StratifiedKFold(n_splits=self.config["cv"], shuffle=True, random_state=RANDOM_STATE)
+            folds = list(cv.split(np.zeros(len(y)), y))
+            rng = np.random.default_rng(RANDOM_STATE)
+            folds = [(stratified_order(train_idx, y, rng), test_idx) for train_idx, test_idx in folds]
+            schedule = self._schedule(min(len(train_idx) for train_idx, _ in folds), len(np.unique(y)))
+            scorer = get_scorer(self.config["scoring"])
+
+            n_cands = len(self.candidates)
+            stats = [{"params": candidate, "rounds": []} for candidate in self.candidates]
+            alive = list(range(n_cands))
+            logging.info(f"{self.config['strategy']} search: {n_cands} candidates, {len(folds)} folds, "
+                         f"rounds at {schedule} training rows")
+
+            start = time.perf_counter()
+            with tempfile.TemporaryDirectory(prefix="accent-search-") as folder:
+                X_shared = shared_matrix(X, folder)
+                with Parallel(n_jobs=self.config["n_jobs"]) as parallel:
+                    for r, n_rows in enumerate(schedule):
+                        chains = [[alive[i] for i in chain] for chain in
+                                  _warm_start_chains(self.estimator, [self.candidates[i] for i in alive])]
+                        tasks = [(fold, chain) for fold in range(len(folds)) for chain in chains]
+                        outputs = parallel(
+                            delayed(_fit_chain)(self.estimator, [self.candidates[i] for i in chain], X_shared, y,
+                                                folds[fold][0][:n_rows], folds[fold][1], scorer)
+                            for fold, chain in tasks
+                        )
+
+                        per_candidate = {i: [] for i in alive}
+                        for (_, chain), results in zip(tasks, outputs):
+                            for i, result in zip(chain, results):
+                                per_candidate[i].append(result)
+                        for i, results in per_candidate.items():
+                            scores, fit_times, score_times = (np.array(v) for v in zip(*results))
+                            stats[i]["rounds"].append({
+                                "round": r,
+                                "n_rows": int(n_rows),
+                                "mean_score": round(float(scores.mean()), 6),
+                                "std_score": round(float(scores.std()), 6),
+                                "mean_fit_time": round(float(fit_times.mean()), 6),
+                                "mean_score_time": round(float(score_times.mean()), 6),
+                            })
+
+                        ranked = sorted(alive, key=lambda i: -stats[i]["rounds"][-1]["mean_score"])
+                        logging.info(f"Round {r}: {len(alive)} candidates on {n_rows} rows, best "
+                                     f"{stats[ranked[0]]['rounds'][-1]['mean_score']:.4f} {self.candidates[ranked[0]]}")
+                        if r < len(schedule) - 1:
+                            alive = sorted(ranked[:max(1, math.ceil(len(alive) / self.config["factor"]))])
+                del X_shared
+
+            best = ranked[0]
+            report = self._report(stats, ranked, schedule, time.perf_counter() - start)
+            logging.info(f"Best parameters: {self.candidates[best]} "
+                         f"({self.config['scoring']} {report['best_score']:.4f}); report → {self.results_path}")
+            return self.candidates[best]
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def _report(self, stats, ranked, schedule, elapsed):
+        # Rank by the last round reached, then by score in that round
+        order = sorted(range(len(stats)), key=lambda i: (-len(stats[i]["rounds"]),
+                                                         -stats[i]["rounds"][-1]["mean_score"]))
+        candidates = []
+        for rank, i in enumerate(order, start=1):
+            last = stats[i]["rounds"][-1]
+            candidates.append({
+                "rank": rank,
+                "params": stats[i]["params"],
+                "mean_score": last["mean_score"],
+                "std_score": last["std_score"],
+                "n_rows": last["n_rows"],
+                "mean_fit_time": last["mean_fit_time"],
+                "total_fit_time": round(sum(r["mean_fit_time"] for r in stats[i]["rounds"]) * self.config["cv"], 6),
+                "rounds": stats[i]["rounds"],
+            })
+
+        report = {
+            "estimator": type(self.estimator).__name__,
+            "strategy": self.config["strategy"],
+            "scoring": self.config["scoring"],
+            "cv": self.config["cv"],
+            "schedule": [int(n) for n in schedule],
+            "n_candidates": len(stats),
+            "elapsed_seconds": round(elapsed, 3),
+            "best_params": stats[ranked[0]]["params"],
+            "best_score": stats[ranked[0]]["rounds"][-1]["mean_score"],
+            "candidates": candidates,
+        }
+        os.makedirs(os.path.dirname(self.results_path), exist_ok=True)
+        with open(self.results_path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        return report
@@ -0,0 +1,225 @@
+# src/components/linear_export.py
+#
+# Folds the fitted scaler into the weights of a linear classifier and saves
+# the result as a small float32 artifact. Scoring then needs a single
+# X @ W.T + b in NumPy, with no pandas, sklearn validation or pyfunc
+# schema checks on the request path.
+
+import os
+import sys
+import argparse
+import numpy as np
+from src.logger import logging
+from src.exception import MyException
+from src.utils.main_utils import load_object
+from src.constants import MODEL_DIR, MODEL_PATH, LINEAR_MODEL_PATH, LINEAR_EXPORT_ATOL
+
+
+def _affine_map(step, n_in: int, feature_names):
+    """
+    Return (A, c) such that step.transform(x) == A @ x + c for a fitted
+    StandardScaler or a ColumnTransformer made of scalers/passthrough/drop.
+    """
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.compose import ColumnTransformer
+
+    if isinstance(step, StandardScaler):
+        mean = step.mean_ if step.with_mean else np.zeros(n_in)
+        scale = step.scale_ if step.with_std else np.ones(n_in)
+        return np.diag(1.0 / scale), -mean / scale
+
+    if isinstance(step, ColumnTransformer):
+        names = list(feature_names) if feature_names is not None else None
+        rows, offsets = [], []
+        for _, transformer, columns in step.transformers_:
+            if transformer == "drop":
+                continue
+            idx = [names.index(c) if isinstance(c, str) else int(c) for c in np.atleast_1d(columns)]
+            if not idx:
+                continue
+            if transformer == "passthrough":
+                A_sub, c_sub = np.eye(len(idx)), np.zeros(len(idx))
+            else:
+                A_sub, c_sub = _affine_map(transformer, len(idx), None)
+            block = np.zeros((len(idx), n_in))
+            block[:, idx] = A_sub
+            rows.append(block)
+            offsets.append(c_sub)
+        return np.vstack(rows), np.concatenate(offsets)
+
+    raise ValueError(f"Cannot fold preprocessing step {type(step).__name__} into linear weights")
+
+
+def _pipeline_affine(steps, columns):
+    """Compose the affine maps of consecutive preprocessing steps."""
+    n = len(columns)
+    A, c = np.eye(n), np.zeros(n)
+    names = list(columns)
+    for step in steps:
+        A_step, c_step = _affine_map(step, A.shape[0], names)
+        A, c = A_step @ A, A_step @ c + c_step
+        names = None
+    return A, c
+
+
+class FastLinearModel:
+    """
+    Pure-NumPy scorer for a scaler + linear classifier pipeline.
+
+    W (n_classes x n_features) and b are float32 with the scaling already
+    folded in, so predict() works on raw feature vectors in `columns` order.
+    Accepts a single vector or a 2-D batch.
+
+    The artifact also carries a few reference rows with the labels sklearn
+    gave them (check_X, check_y), so a loader can confirm that the artifact
+    belongs to the model it is about to replace.
+    """
+
+    def __init__(self, W, b, classes, columns, check_X=None, check_y=None):
+        self.W = np.ascontiguousarray(W, dtype=np.float32)
+        self.b = np.ascontiguousarray(b, dtype=np.float32)
+        self.classes = np.asarray(classes)
+        self.columns = [str(c) for c in columns]
+        self.check_X = check_X
+        self.check_y = check_y
+
+    @classmethod
+    def from_pipeline(cls, pipeline, columns=None):
+        """
+        Fold a fitted sklearn Pipeline([...preprocessing, linear classifier]).
+        Every preprocessing step must be an affine map (StandardScaler, or a
+        ColumnTransformer of scalers and passthrough).
+        """
+        steps = [step for _, step in pipeline.steps] if hasattr(pipeline, "steps") else [pipeline]
+        classifier = steps[-1]
+        if not (hasattr(classifier, "coef_") and hasattr(classifier, "intercept_")):
+            raise ValueError(f"{type(classifier).__name__} is not a linear classifier")
+
+        if columns is None:
+            columns = getattr(pipeline, "feature_names_in_", None)
+            if columns is None:
+                raise ValueError("Feature column names are required to export the model")
+        columns = list(columns)
+
+        A, c = _pipeline_affine(steps[:-1], columns)
+        coef = np.atleast_2d(classifier.coef_).astype(np.float64)
+        W = coef @ A
+        b = coef @ c + np.ravel(classifier.intercept_)
+        return cls(W, b, classifier.classes_, columns)
+
+    def decision_function(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        single = X.ndim == 1
+        scores = np.atleast_2d(X) @ self.W.T + self.b
+        if scores.shape[1] == 1:
+            scores = scores[:, 0]
+        return scores[0] if single else scores
+
+    def predict_index(self, X):
+        """Index into self.classes for each row (a scalar for a single vector)."""
+        scores = self.decision_function(X)
+        if self.W.shape[0] == 1:
+            return (scores > 0).astype(np.intp)
+        return np.argmax(scores, axis=-1)
+
+    def predict(self, X):
+        return self.classes[self.predict_index(X)]
+
+    def save(self, path: str = LINEAR_MODEL_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            extra = {} if self.check_X is None else {"check_X": self.check_X, "check_y": self.check_y}
+            np.savez(f, W=self.W, b=self.b, classes=self.classes, columns=np.asarray(self.columns), **extra)
+        logging.info(f"Linear model ({self.W.shape[0]}x{self.W.shape[1]} float32) saved to {path}")
+
+    @classmethod
+    def load(cls, path: str = LINEAR_MODEL_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            check = (data["check_X"], data["check_y"]) if "check_X" in data else (None, None)
+            return cls(data["W"], data["b"], data["classes"], data["columns"].tolist(), *check)
+
+    def matches(self, model, columns) -> bool:
+        """
+        True if the artifact has the expected columns and `model` (anything
+        with predict(DataFrame)) labels the stored reference rows the same way.
+        """
+        import pandas as pd
+
+        if list(columns) != self.columns or self.check_X is None:
+            return False
+        X = pd.DataFrame(self.check_X.astype(np.float64), columns=self.columns)
+        expected = np.ravel(model.predict(X))
+        return bool(np.array_equal(expected, self.check_y) and np.array_equal(self.predict(self.check_X), self.check_y))
+
+
+def verify_fast_model(fast: FastLinearModel, pipeline, X, atol: float = LINEAR_EXPORT_ATOL) -> float:
+    """
+    Check the fast path against the sklearn pipeline on X (raw features).
+    Returns the max absolute decision-function difference; raises ValueError
+    if it exceeds atol or a label differs on a row that is not a near-tie.
+    """
+    import pandas as pd
+
+    X = pd.DataFrame(np.asarray(X, dtype=np.float64), columns=fast.columns)
+    expected = np.asarray(pipeline.decision_function(X))
+    scores = fast.decision_function(X.to_numpy())
+    max_diff = float(np.max(np.abs(expected - scores)))
+    scale = max(1.0, float(np.max(np.abs(expected))))
+    if max_diff > atol * scale:
+        raise ValueError(f"Fast path deviates from sklearn by {max_diff:.3g} (> {atol * scale:.3g})")
+
+    mismatch = fast.predict(X.to_numpy()) != pipeline.predict(X)
+    if np.any(mismatch):
+        # Allowed only where the two best scores are within the tolerance
+        if expected.ndim == 1:
+            margin = np.abs(expected[mismatch])
+        else:
+            top2 = np.sort(expected[mismatch], axis=1)[:, -2:]
+            margin = top2[:, 1] - top2[:, 0]
+        if np.any(margin > atol * scale):
+            raise ValueError(f"Fast path disagrees with sklearn on {int(mismatch.sum())} row(s)")
+    return max_diff
+
+
+def export_linear_model(pipeline, path: str = LINEAR_MODEL_PATH, X_check=None, columns=None) -> FastLinearModel:
+    """
+    Fold `pipeline`, verify it on X_check (or on probe rows drawn around the
+    scaler statistics) and save the float32 artifact to `path`.
+    """
+    try:
+        fast = FastLinearModel.from_pipeline(pipeline, columns)
+        if X_check is None:
+            # Probe rows: standard-normal in the scaled space, mapped back to raw features
+            steps = [step for _, step in pipeline.steps[:-1]] if hasattr(pipeline, "steps") else []
+            A, c = _pipeline_affine(steps, fast.columns)
+            Z = np.random.default_rng(0).standard_normal((256, A.shape[0]))
+            X_check = (Z - c) @ np.linalg.pinv(A).T
+        max_diff = verify_fast_model(fast, pipeline, X_check)
+        logging.info(f"Linear fast path verified (max |diff| {max_diff:.2e})")
+
+        # Keep reference rows whose label is not a near-tie
+        X_check = np.asarray(X_check, dtype=np.float32)
+        labels = fast.predict(X_check)
+        scores = np.atleast_2d(fast.decision_function(X_check).T).T
+        top2 = np.sort(np.abs(scores) if scores.shape[1] == 1 else scores, axis=1)
+        margin = top2[:, -1] - (top2[:, -2] if scores.shape[1] > 1 else 0)
+        keep = np.argsort(-margin)[:32]
+        fast.check_X, fast.check_y = X_check[keep], labels[keep]
+
+        fast.save(path)
+        return fast
+    except Exception as e:
+        raise MyException(e, sys)
+
+
+if __name__ == "__main__":
+    from sklearn.pipeline import Pipeline
+
+    parser = argparse.ArgumentParser(description="Export the trained scaler + linear model as a float32 artifact")
+    parser.add_argument("--output", default=LINEAR_MODEL_PATH)
+    args = parser.parse_args()
+
+    preprocessor = load_object(os.path.join(MODEL_DIR, "preprocessor.joblib"))
+    model = load_object(MODEL_PATH)
+    export_linear_model(Pipeline(steps=[("preprocessor", preprocessor), ("classifier", model)]), args.output,
+                        columns=preprocessor.feature_names_in_)
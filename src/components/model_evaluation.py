@@ -7,16 +7,24 @@ from src.constants import *
 from src.exception import MyException
 import sys
 
+def classification_metrics(y_true, y_pred) -> dict:
+    return {
+        'accuracy': round(accuracy_score(y_true, y_pred), 4),
+        'precision': round(precision_score(y_true, y_pred, average='weighted', zero_division=0), 4),
+        'recall': round(recall_score(y_true, y_pred, average='weighted', zero_division=0), 4),
+        'f1_score': round(f1_score(y_true, y_pred, average='weighted', zero_division=0), 4)
+    }
+
 class ModelEvaluator:
     def __init__(self, model_path=MODEL_PATH):
         self.model_path = model_path
         self.metrics_path = METRICS_PATH
         os.makedirs(os.path.dirname(self.metrics_path), exist_ok=True)
 
-    def initiate_model_evaluation(self, test_csv: str):
+    def initiate_model_evaluation(self, test_path: str):
         try:
             # Step 1: Load test data
-            df = load_dataframe(test_csv)
+            df = load_dataframe(test_path)
             X_test = df.drop(columns=['label'])
             y_true = df['label']
 
@@ -24,23 +32,30 @@ class ModelEvaluator:
             model = load_object(self.model_path)
             logging.info("Model loaded successfully.")
 
+            return self.evaluate(model, X_test, y_true)
+
+        except Exception as e:
+            raise MyException(e,sys)
+
+    def evaluate(self, model, X_test, y_true, save_metrics: bool = True):
+        """
+        Score an in-memory model on in-memory test data; with save_metrics
+        the metrics are also written to METRICS_PATH.
+        """
+        try:
             # Step 3: Predict
             logging.info("Predicting on test data...")
             y_pred = model.predict(X_test)
 
             # Step 4: Calculate metrics
             logging.info("Calculating evaluation metrics...")
-            metrics = {
-                'accuracy': round(accuracy_score(y_true, y_pred), 4),
-                'precision': round(precision_score(y_true, y_pred, average='weighted', zero_division=0), 4),
-                'recall': round(recall_score(y_true, y_pred, average='weighted', zero_division=0), 4),
-                'f1_score': round(f1_score(y_true, y_pred, average='weighted', zero_division=0), 4)
-            }
+            metrics = classification_metrics(y_true, y_pred)
 
     
             # Step 7: Save metrics locally
-            write_yaml(self.metrics_path, metrics)
-            logging.info(f"Metrics saved locally at: {self.metrics_path}")
+            if save_metrics:
+                write_yaml(self.metrics_path, metrics)
+                logging.info(f"Metrics saved locally at: {self.metrics_path}")
             return metrics , y_pred , y_true
             
         except Exception as e:
@@ -0,0 +1,235 @@
+# src/components/model_league.py
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+import joblib
+import numpy as np
+from from_root import from_root
+from src.logger import logging
+from src.exception import MyException
+from src.constants import LEAGUE_CONFIG, LEAGUE_RESULTS_PATH, TRAIN_DATA, TEST_DATA
+from src.utils.main_utils import load_dataframe, read_yaml
+from src.components.model_evaluation import classification_metrics
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak memory is then not reported
+    resource = None
+
+# Metrics used for ranking and whether higher is better
+RANKED_METRICS = {
+    "f1_score": True,
+    "single_p99_ms": False,
+    "batch_p99_ms": False,
+    "artifact_bytes": False,
+    "fit_peak_memory_mb": False,
+}
+
+
+def load_league_config(params: dict) -> dict:
+    """
+    The `league` section of params.yaml merged over LEAGUE_CONFIG.
+    """
+    return {**LEAGUE_CONFIG, **(params.get("league") or {})}
+
+
+def _rss_mb():
+    """
+    (current RSS, peak RSS) of this process in MiB. On Linux the peak counts
+    from the last _reset_peak_rss(); elsewhere it is the lifetime peak.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            status = dict(line.split(":", 1) for line in f if line.startswith(("VmRSS", "VmHWM")))
+        return int(status["VmRSS"].split()[0]) / 1024, int(status["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError):
+        if resource is None:
+            return None, None
+        # ru_maxrss is in KiB on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return peak, peak
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _train_candidate(spec, train_path):
+    """
+    Fit one candidate in a fresh worker process. Returns its fit time, how
+    far the process's RSS peaked above its level before fit, and the
+    serialized model.
+    """
+    from src.components.model_training import ModelTrainer
+
+    try:
+        df = load_dataframe(train_path)
+        X, y = df.drop(columns=["label"]), df["label"]
+        model = ModelTrainer()._get_model_instance(spec["model"], spec.get("hyperparameters") or {})
+
+        _reset_peak_rss()
+        rss_before, _ = _rss_mb()
+        start = time.perf_counter()
+        model.fit(X, y)
+        fit_seconds = time.perf_counter() - start
+        _, peak_after = _rss_mb()
+
+        buffer = io.BytesIO()
+        joblib.dump(model, buffer)
+        return {
+            "fit_seconds": fit_seconds,
+            "fit_peak_memory_mb": None if rss_before is None else max(0.0, peak_after - rss_before),
+            "artifact": buffer.getvalue(),
+        }
+    except Exception as e:
+        return {"error": repr(e)}
+
+
+class ModelLeague:
+    """
+    Trains every candidate classifier of the `league` section of params.yaml
+    on the same preprocessed split and ranks them on quality, latency and
+    footprint.
+
+    Candidates are fitted in parallel, each in a fresh process so its peak
+    memory is its own. Latency is then measured here, one model at a time,
+    so the timings do not compete with other fits for the CPU: single-row
+    and batch_size-row predict calls on DataFrames, as the serving path
+    makes them. The rank is the weighted mean of the per-metric ranks.
+    """
+
+    def __init__(self, config: dict | None = None, train_path: str = TRAIN_DATA, test_path: str = TEST_DATA,
+                 results_path: str = LEAGUE_RESULTS_PATH):
+        self.config = {**LEAGUE_CONFIG, **(config or {})}
+        self.train_path = train_path
+        self.test_path = test_path
+        self.results_path = results_path
+        if not self.config["candidates"]:
+            raise ValueError("No league candidates configured in params.yaml")
+
+    @staticmethod
+    def _name(spec):
+        return spec.get("name") or spec["model"]
+
+    def _latency(self, model, X):
+        """
+        p50/p99 latency of single-row and batched predict calls and the
+        batched throughput.
+        """
+        repeats, batch_size = self.config["latency_repeats"], self.config["batch_size"]
+        singles = [X.iloc[[i % len(X)]] for i in range(repeats)]
+        batches = [X.iloc[np.arange(i, i + batch_size) % len(X)] for i in range(repeats)]
+
+        timings = {}
+        for kind, inputs in (("single", singles), ("batch", batches)):
+            model.predict(inputs[0])
+            elapsed = np.empty(repeats)
+            for i, X_call in enumerate(inputs):
+                start = time.perf_counter()
+                model.predict(X_call)
+                elapsed[i] = time.perf_counter() - start
+            timings[f"{kind}_p50_ms"] = round(float(np.percentile(elapsed, 50)) * 1000, 4)
+            timings[f"{kind}_p99_ms"] = round(float(np.percentile(elapsed, 99)) * 1000, 4)
+            if kind == "batch":
+                timings["throughput_rows_per_s"] = round(batch_size / float(elapsed.mean()), 1)
+        return timings
+
+    def _rank(self, entries):
+        weights = {k: w for k, w in self.config["weights"].items() if k in RANKED_METRICS and w}
+        for metric, higher_is_better in RANKED_METRICS.items():
+            values = [entry.get(metric) for entry in entries]
+            if metric not in weights or any(v is None for v in values):
+                weights.pop(metric, None)
+                continue
+            order = sorted(values, reverse=higher_is_better)
+            for entry in entries:
+                entry.setdefault("metric_ranks", {})[metric] = order.index(entry[metric]) + 1
+
+        total = sum(weights.values())
+        for entry in entries:
+            entry["score"] = round(sum(w * entry["metric_ranks"][m] for m, w in weights.items()) / total, 4)
+        entries.sort(key=lambda entry: (entry["score"], -entry["f1_score"]))
+        for rank, entry in enumerate(entries, start=1):
+            entry["rank"] = rank
+        return entries
+
+    def run(self) -> list[dict]:
+        try:
+            candidates = self.config["candidates"]
+            n_jobs = self.config["n_jobs"]
+            n_jobs = os.cpu_count() if n_jobs == -1 else max(1, n_jobs)
+            logging.info(f"League: {len(candidates)} candidates, {min(n_jobs, len(candidates))} parallel fits")
+
+            # One fresh process per candidate (maxtasksperchild=1, one task per chunk)
+            with multiprocessing.get_context("spawn").Pool(processes=min(n_jobs, len(candidates)),
+                                                           maxtasksperchild=1) as pool:
+                fits = pool.starmap(_train_candidate, [(spec, self.train_path) for spec in candidates],
+                                    chunksize=1)
+
+            df = load_dataframe(self.test_path)
+            X_test, y_test = df.drop(columns=["label"]), df["label"]
+
+            entries, failed = [], []
+            for spec, fit in zip(candidates, fits):
+                name = self._name(spec)
+                if "error" in fit:
+                    logging.warning(f"[LEAGUE] {name} failed: {fit['error']}")
+                    failed.append({"name": name, "model": spec["model"], "error": fit["error"]})
+                    continue
+                model = joblib.load(io.BytesIO(fit["artifact"]))
+                entry = {
+                    "name": name,
+                    "model": spec["model"],
+                    "hyperparameters": spec.get("hyperparameters") or {},
+                    **classification_metrics(y_test, model.predict(X_test)),
+                    "fit_seconds": round(fit["fit_seconds"], 4),
+                    "fit_peak_memory_mb": None if fit["fit_peak_memory_mb"] is None
+                    else round(fit["fit_peak_memory_mb"], 2),
+                    "artifact_bytes": len(fit["artifact"]),
+                    **self._latency(model, X_test),
+                }
+                entries.append(entry)
+                logging.info(f"[LEAGUE] {name}: f1 {entry['f1_score']}, single p99 {entry['single_p99_ms']}ms, "
+                             f"batch p99 {entry['batch_p99_ms']}ms, {entry['artifact_bytes']} bytes")
+
+            entries = self._rank(entries) if entries else []
+            report = {
+                "batch_size": self.config["batch_size"],
+                "latency_repeats": self.config["latency_repeats"],
+                "weights": self.config["weights"],
+                "ranking": entries,
+                "failed": failed,
+            }
+            os.makedirs(os.path.dirname(self.results_path), exist_ok=True)
+            with open(self.results_path, "w") as f:
+                json.dump(report, f, indent=2, default=str)
+
+            for entry in entries:
+                logging.info(f"#{entry['rank']} {entry['name']}: score {entry['score']}, f1 {entry['f1_score']}, "
+                             f"single p50/p99 {entry['single_p50_ms']}/{entry['single_p99_ms']}ms, "
+                             f"{entry['throughput_rows_per_s']} rows/s, {entry['artifact_bytes']} bytes, "
+                             f"fit peak {entry['fit_peak_memory_mb']}MB")
+            logging.info(f"League report written to {self.results_path}")
+            return entries
+        except Exception as e:
+            raise MyException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train and rank the league candidates from params.yaml.")
+    parser.add_argument("--n-jobs", type=int, default=None, help="parallel fits (-1 = all cores)")
+    args = parser.parse_args()
+
+    config = load_league_config(read_yaml(os.path.join(from_root(), "params.yaml")))
+    if args.n_jobs is not None:
+        config["n_jobs"] = args.n_jobs
+    ModelLeague(config).run()
@@ -2,11 +2,23 @@ import os
 from from_root import from_root
 from src.logger import logging
 from src.utils.main_utils import load_dataframe, read_yaml, save_object
+import importlib
 from sklearn.base import ClassifierMixin
-from sklearn.utils import all_estimators
 from src.constants import *
 import sys 
 from src.exception import MyException
+from src.components.hyperparameter_search import HyperparameterSearch, load_search_config
+
+CLASSIFIER_MODULES = (
+    "sklearn.linear_model",
+    "sklearn.ensemble",
+    "sklearn.svm",
+    "sklearn.neighbors",
+    "sklearn.tree",
+    "sklearn.naive_bayes",
+    "sklearn.discriminant_analysis",
+    "sklearn.neural_network",
+)
 
 class ModelTrainer:
     def __init__(self, model_path= MODEL_PATH):
@@ -15,31 +27,59 @@ class ModelTrainer:
     def _get_model_instance(self, model_name: str, model_params: dict) -> ClassifierMixin:
         """
         Dynamically retrieve model class from sklearn by name.
+
+        The common classifier modules are searched first so only the module
+        that defines the model gets imported; sklearn.utils.all_estimators()
+        (which imports every estimator module) is the fallback.
         """
+        for module_name in CLASSIFIER_MODULES:
+            estimator = getattr(importlib.import_module(module_name), model_name, None)
+            if isinstance(estimator, type) and issubclass(estimator, ClassifierMixin):
+                return estimator(**model_params)
+
+        from sklearn.utils import all_estimators
+
         estimators = dict(all_estimators(type_filter='classifier'))
         if model_name not in estimators:
             raise ValueError(f" Unsupported model type: {model_name}")
         return estimators[model_name](**model_params)
 
-    def initiate_model_training(self, train_csv: str) -> None:
+    def train(self, X, y):
+        """
+        Fit the model configured in params.yaml (after the hyperparameter
+        search, if enabled) on in-memory data. Nothing is written to disk.
+        """
         try:
-            logging.info("Loading training data...")
-            df = load_dataframe(train_csv)
-            X = df.drop(columns=['label'])
-            y = df['label']
-
             logging.info("Reading training configuration from YAML...")
             config_path = os.path.join(from_root(), "params.yaml")
             params = read_yaml(config_path)
             model_name = params['model_training']['model']
             model_params = params['model_training'].get('hyperparameters', {})
 
+            search_config = load_search_config(params)
+            if search_config["enabled"]:
+                logging.info(f"Searching hyperparameters for {model_name} over {search_config['space']}")
+                search = HyperparameterSearch(self._get_model_instance(model_name, model_params), search_config)
+                model_params = {**model_params, **search.run(X, y)}
+
             logging.info(f"Initializing model: {model_name} with params: {model_params}")
             model = self._get_model_instance(model_name, model_params)
 
             logging.info("Training model...")
             model.fit(X, y)
+            return model, model_name, model_params
+
+        except Exception as e:
+            raise MyException(e,sys)
+
+    def initiate_model_training(self, train_path: str) -> None:
+        try:
+            logging.info("Loading training data...")
+            df = load_dataframe(train_path)
+            X = df.drop(columns=['label'])
+            y = df['label']
 
+            model, model_name, model_params = self.train(X, y)
 
             os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
             save_object(self.model_path, model)
@@ -1,7 +1,6 @@
 import os
 import matplotlib.pyplot as plt
 import seaborn as sns
-import pandas as pd
 import numpy as np
 from sklearn.metrics import confusion_matrix
 from sklearn.model_selection import LearningCurveDisplay
@@ -10,9 +9,9 @@ from src.logger import logging
 from from_root import from_root
 
 
-def log_confusion_matrix(y_true, y_pred, labels=None):
+def log_confusion_matrix(y_true, y_pred, labels=None, cm=None):
     try:
-        cm = confusion_matrix(y_true, y_pred)
+        cm = confusion_matrix(y_true, y_pred) if cm is None else cm
         plt.figure(figsize=(6, 5))
         sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', xticklabels=labels, yticklabels=labels)
         plt.title("Confusion Matrix")
@@ -28,22 +27,18 @@ def log_confusion_matrix(y_true, y_pred, labels=None):
         logging.warning(f"Could not log confusion matrix: {e}")
 
 
-def log_learning_curve(model, train_csv, target_col="label"):
+def log_learning_curve(curve, score_name="accuracy"):
+    """
+    Plot a learning curve from precomputed scores (TrainingDiagnostics.learning_curve()).
+    """
     try:
-        df = pd.read_csv(train_csv)
-        X = df.drop(columns=[target_col])
-        y = df[target_col]
-
-        display = LearningCurveDisplay.from_estimator(
-            model,
-            X,
-            y,
-            train_sizes=np.linspace(0.1, 1.0, 5),
-            cv=5,
-            score_type="both",
-            scoring="accuracy",
-            n_jobs=-1
+        display = LearningCurveDisplay(
+            train_sizes=np.asarray(curve["train_sizes"]),
+            train_scores=np.asarray(curve["train_scores"]),
+            test_scores=np.asarray(curve["test_scores"]),
+            score_name=score_name,
         )
+        display.plot(score_type="both")
 
         path = os.path.join(from_root(), "reports", "learning_curve.png")
         plt.savefig(path)
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from from_root import from_root
 
 
@@ -8,12 +9,28 @@ from from_root import from_root
 SAMPLE_RATE = 22050       # Audio sampling rate
 DURATION = 10             # Duration of audio to load (in seconds)
 
+RESAMPLE_TYPE = "soxr_hq" # librosa res_type: soxr_vhq/soxr_hq/soxr_mq/soxr_lq (quality vs speed)
+
 FRAME_LENGTH = 1024       # Frame size for FFT
 HOP_LENGTH = 512          # Hop size for STFT
 
-NUM_FILES = 90            # Number of files per accent
 MFCC_COUNT = 13           # Number of MFCCs to extract
 
+FEATURE_N_JOBS = 1        # Worker processes for feature extraction (-1 = all cores)
+FEATURE_CHUNK_SIZE = 8    # Files per work unit (and per augmentation stack)
+FEATURE_WRITE_CHUNK_ROWS = 1024  # Feature rows buffered per append to the feature store
+
+HOP_LENGTH_STRETCH = 512  # STFT hop for time stretch / pitch shift (librosa default for n_fft=2048)
+
+# Default augmentation recipe; overridden by the `augmentation` section of params.yaml
+AUGMENTATION_RECIPE = {
+    "seed": 42,
+    "time_stretch_rates": [1.2],
+    "pitch_shift_steps": [2],
+    "noise_levels": [0.005],
+    "noise_snr_db": [],
+}
+
 
 LABELS = {
     "indian_accent": "indian",
@@ -22,22 +39,109 @@ LABELS = {
 }
 
 RAW_DATA_DIR = os.path.join(from_root(), "data", "raw")
+DATASET_INDEX_PATH = os.path.join(from_root(), "data", "interim", "dataset_index.json")  # see data_indexing.py
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg")    # Formats the indexer picks up (readable by soundfile)
 PREPROCESSED_DATA_DIR = os.path.join(from_root(), "data", "preprocessed")
 INTERIM_DATA_DIR = os.path.join(from_root(), "data", "interim")
 DATA_AUGMENTED_DIR = os.path.join(from_root(),"data","augmented_data")
 
+# Feature cache constants
+FEATURE_CACHE_DIR = os.path.join(from_root(), "data", "cache", "features")
+FEATURE_CACHE_MAX_BYTES = 512 * 1024 * 1024   # 512 MB
+
 # Data Preprocessing constants
 
+# Stage hand-offs use the binary feature store (src/utils/feature_store.py);
+# the .csv paths are only written when CSV export is requested.
+FEATURES_DATA = os.path.join(from_root(), "data", "interim", "features.store")
 FEATURES_CSV = os.path.join(from_root(), "data", "interim", "features.csv")
-TRAIN_DATA = os.path.join(from_root(), "data", "preprocessed", "train_data.csv")
-TEST_DATA = os.path.join(from_root(), "data", "preprocessed", "test_data.csv")
+TRAIN_DATA = os.path.join(from_root(), "data", "preprocessed", "train_data.store")
+TEST_DATA = os.path.join(from_root(), "data", "preprocessed", "test_data.store")
 TEST_SIZE = 0.2
 RANDOM_STATE = 42
 
 # Model Training constants
 MODEL_PATH = os.path.join(from_root(), "models", "model.joblib")
 MODEL_DIR = os.path.join(from_root(), "models")
+LINEAR_MODEL_PATH = os.path.join(from_root(), "models", "linear_model.npz")  # folded scaler + linear weights
+LINEAR_EXPORT_ATOL = 1e-4                   # fast path vs sklearn tolerance (relative to max |score|)
 METRICS_PATH = os.path.join(from_root(), "reports", "metrics.yaml")
 REPORTS_DIR = os.path.join(from_root(), "reports")
+SEARCH_RESULTS_PATH = os.path.join(from_root(), "reports", "search_results.json")
+# Hyperparameter search defaults; params.yaml `model_training.search` overrides them
+SEARCH_CONFIG = {
+    "enabled": False,
+    "strategy": "halving",    # halving (successive halving over training rows) | grid
+    "cv": 5,
+    "scoring": "f1_weighted",
+    "factor": 3,              # halving: keep 1/factor of the candidates per round
+    "min_resources": None,    # halving: training rows in the first round (None = as few as the rounds allow)
+    "n_jobs": -1,
+    "space": {},              # hyperparameter -> list of values
+}
+DIAGNOSTICS_PATH = os.path.join(from_root(), "reports", "diagnostics.json")
+DIAGNOSTICS_CV = 5                          # Folds of the shared diagnostics CV plan
+DIAGNOSTICS_TRAIN_SIZES = [0.1, 0.325, 0.55, 0.775, 1.0]  # Learning-curve sizes (fractions of a training fold)
+DIAGNOSTICS_N_JOBS = min(4, os.cpu_count() or 1)  # Bounded pool for the diagnostics fits
+LEAGUE_RESULTS_PATH = os.path.join(from_root(), "reports", "league.json")
+# Model league defaults (python -m src.components.model_league); params.yaml `league` overrides them
+LEAGUE_CONFIG = {
+    "n_jobs": -1,             # candidates trained in parallel, one fresh process each
+    "latency_repeats": 200,   # timed predict calls per latency measurement
+    "batch_size": 32,         # rows per batched predict call (cf. PREDICT_MAX_BATCH_SIZE)
+    # Ranking weights: F1 higher is better, the others lower is better
+    "weights": {"f1_score": 2.0, "single_p99_ms": 1.0, "batch_p99_ms": 1.0,
+                "artifact_bytes": 1.0, "fit_peak_memory_mb": 1.0},
+    "candidates": [],         # [{"model": ..., "hyperparameters": {...}}]
+}
+
+# Serving model resolution (see src/pipeline/model_resolver.py)
+MODEL_NAME = "AccentClassifier"
+MODEL_VERSION = os.environ.get("ACCENT_MODEL_VERSION", "2")        # pinned registry version
+MODEL_CACHE_DIR = os.path.join(from_root(), "models", "cache")
+MODEL_OFFLINE = os.environ.get("ACCENT_MODEL_OFFLINE", "0") == "1"  # never contact the registry
+IMPORT_BUDGET_SECONDS = 1.5    # Max cumulative `import app` time (python -m src.utils.import_profile)
+
+# Prediction constants
+PREDICT_BATCH_WORKERS = 4                   # Decode/extract threads for batch prediction
+MAX_BATCH_CONTENT_LENGTH = 256 * 1024 * 1024  # 256MB max request size for /predict_batch
+STREAM_WINDOW_SECONDS = DURATION            # Window length for streaming inference
+STREAM_HOP_SECONDS = DURATION               # Hop between streaming windows
+STREAM_MIN_SECONDS = 1.0                    # Trailing windows shorter than this are dropped
+PREDICT_BATCH_WINDOW_MS = float(os.environ.get("ACCENT_BATCH_WINDOW_MS", "5"))  # micro-batch wait; 0 disables
+PREDICT_MAX_BATCH_SIZE = 32                 # Max rows per micro-batched model call
+FAST_LINEAR = os.environ.get("ACCENT_FAST_LINEAR", "1") == "1"  # use the folded NumPy scorer when available
+
+# Web app upload store
+UPLOAD_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Memory budget for decoded uploads
+UPLOAD_TTL_SECONDS = 30 * 60                # Idle uploads (and temp files) expire after this
+VIZ_POINTS = 800                            # Max points per series in /visualize data mode
+
+# Async serving mode (see src/pipeline/serving_pool.py); 0 workers = run inline
+SERVE_WORKERS = int(os.environ.get("ACCENT_SERVE_WORKERS", "0"))  # CPU worker processes
+SERVE_MAX_PENDING = int(os.environ.get("ACCENT_SERVE_MAX_PENDING", "16"))  # queued + running tasks before 503
+SERVE_TIMEOUT_SECONDS = float(os.environ.get("ACCENT_SERVE_TIMEOUT", "30"))  # per-request wait before 504
+SERVE_RETRY_AFTER_SECONDS = 1               # Retry-After header sent with 503
+SERVE_DRAIN_SECONDS = float(os.environ.get("ACCENT_SERVE_DRAIN_SECONDS", "8"))  # SIGTERM wait for in-flight requests (docker stop allows 10s)
+
+MLFLOW_TRACKING_URI = "https://dagshub.com/Himanshu0518/Accent-Recognition.mlflow"
+MLFLOW_EXPERIMENT = "Accent Recognition"
+
+# Store-and-forward tracking (see src/utils/tracking_queue.py): runs are logged
+# locally and forwarded to MLFLOW_TRACKING_URI in the background
+LOCAL_TRACKING_URI = os.environ.get("ACCENT_LOCAL_TRACKING_URI", Path(from_root(), "mlruns").as_uri())
+MLFLOW_QUEUE_DIR = os.path.join(from_root(), "mlruns_queue")
+FORWARD_RETRY_SECONDS = 30                  # First retry delay; doubles per failed attempt
+FORWARD_RETRY_MAX_SECONDS = 3600            # Cap on the retry delay
+FORWARD_DRAIN_SECONDS = float(os.environ.get("ACCENT_FORWARD_DRAIN_SECONDS", "10"))  # max wait at exit; unsent runs stay queued on disk
+FORWARD_REQUEST_TIMEOUT_SECONDS = 15        # Per-request HTTP timeout of the forwarding client
+FORWARD_REQUEST_MAX_RETRIES = 1             # HTTP retries per request; the queue's backoff does the rest
 
-MLFLOW_TRACKING_URI = "https://dagshub.com/Himanshu0518/Accent-Recognition.mlflow"
\ No newline at end of file
+# Hot-path microbenchmarks (see benchmarks/hot_paths.py)
+BENCHMARK_BASELINE_PATH = os.path.join(from_root(), "benchmarks", "baseline.json")
+BENCHMARK_RESULTS_PATH = os.path.join(from_root(), "reports", "benchmarks.json")
+BENCHMARK_DURATIONS = (1.0, 5.0, 30.0)          # Synthetic clip lengths in seconds
+BENCHMARK_SAMPLE_RATES = (16000, 22050, 44100)  # Synthetic clip sample rates
+BENCHMARK_REPEATS = 10                      # Timed calls per case (after one warm-up call)
+BENCHMARK_REGRESSION_THRESHOLD = 0.25       # Fail when a median is this much slower than its baseline
+BENCHMARK_NOISE_FLOOR_MS = 0.5              # Ignore slowdowns smaller than this in absolute terms
@@ -0,0 +1,89 @@
+# src/pipeline/end_to_end_pipeline.py
+#
+# Extraction -> preprocessing -> training -> evaluation in one process, with
+# the data held in memory as float32 arrays between the steps. Meant for
+# quick iteration; the DVC stages remain the reproducible path.
+
+import sys
+import time
+import argparse
+import pandas as pd
+from src.logger import logging
+from src.exception import MyException
+from src.constants import *
+from src.utils.main_utils import save_object
+from src.utils.feature_cache import FeatureCache
+from src.components.data_indexing import DatasetIndexer
+from src.components.feature_extraction import FeatureExtractor
+from src.components.data_preprocessing import DataPreprocessor
+from src.components.model_training import ModelTrainer
+from src.components.model_evaluation import ModelEvaluator
+
+
+def run_end_to_end(data_dir=RAW_DATA_DIR, index=None, n_jobs=FEATURE_N_JOBS, chunk_size=FEATURE_CHUNK_SIZE,
+                   feature_cache=None, persist=False):
+    """
+    Run the whole pipeline in-process and return (model, metrics, timings).
+
+    The preprocessor is fitted on the training split only and applied to
+    the test split, as at serving time. With persist=True the preprocessed
+    splits, the preprocessor, label encoder, model and metrics are written
+    where the DVC stages put them; the feature store is left to the
+    extraction stage (it owns the manifest used for incremental runs).
+    """
+    try:
+        timings = {}
+        start = time.perf_counter()
+
+        extractor = FeatureExtractor()
+        X, labels = extractor.extract_arrays(data_dir, index, n_jobs, chunk_size, feature_cache)
+        df = pd.DataFrame(X, columns=extractor.columns(), copy=False)
+        df["label"] = labels
+        timings["extraction"] = time.perf_counter() - start
+
+        step = time.perf_counter()
+        preprocessor = DataPreprocessor(input_path=FEATURES_DATA, output_dir=PREPROCESSED_DATA_DIR)
+        train_df, test_df, fitted, label_encoder = preprocessor.split_and_transform(df)
+        if persist:
+            preprocessor.save(train_df, test_df, fitted, label_encoder)
+        timings["preprocessing"] = time.perf_counter() - step
+
+        step = time.perf_counter()
+        model, model_name, model_params = ModelTrainer().train(train_df.drop(columns=["label"]), train_df["label"])
+        if persist:
+            save_object(MODEL_PATH, model)
+        timings["training"] = time.perf_counter() - step
+
+        step = time.perf_counter()
+        metrics, _, _ = ModelEvaluator().evaluate(model, test_df.drop(columns=["label"]), test_df["label"],
+                                                  save_metrics=persist)
+        timings["evaluation"] = time.perf_counter() - step
+        timings["total"] = time.perf_counter() - start
+
+        logging.info(f"End-to-end run: {len(df)} rows, {model_name} {model_params}, metrics {metrics}, "
+                     f"timings {({k: round(v, 3) for k, v in timings.items()})}")
+        return model, metrics, timings
+    except Exception as e:
+        raise MyException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run extraction → training → evaluation in one process.")
+    parser.add_argument("--n-jobs", type=int, default=FEATURE_N_JOBS,
+                        help="feature extraction workers (1 = serial, -1 = all cores)")
+    parser.add_argument("--chunk-size", type=int, default=FEATURE_CHUNK_SIZE)
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore the content-addressed feature cache")
+    parser.add_argument("--persist", action="store_true",
+                        help="write the preprocessed splits, artifacts and metrics like the DVC stages")
+    args = parser.parse_args()
+
+    index = DatasetIndexer().load()
+    model, metrics, timings = run_end_to_end(
+        index=index,
+        n_jobs=args.n_jobs,
+        chunk_size=args.chunk_size,
+        feature_cache=None if args.no_cache else FeatureCache(),
+        persist=args.persist,
+    )
+    print(metrics)
@@ -0,0 +1,105 @@
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+from src.logger import logging
+from src.constants import PREDICT_MAX_BATCH_SIZE, PREDICT_BATCH_WINDOW_MS
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching for concurrent single-clip requests.
+
+    Callers submit one feature row each and get a Future back. A scheduler
+    thread takes the oldest waiting row, keeps collecting rows until the
+    batch holds max_batch_size of them or window_ms has passed since the
+    oldest one arrived, then makes a single vectorised predict_rows(rows)
+    call and fans the labels back out to the waiting futures.
+
+    Queue depth, batch sizes and per-request wait times are kept for the
+    most recent `history` batches and requests and reported by stats().
+    """
+
+    def __init__(self, predict_rows, max_batch_size: int = PREDICT_MAX_BATCH_SIZE,
+                 window_ms: float = PREDICT_BATCH_WINDOW_MS, history: int = 1000):
+        self.predict_rows = predict_rows
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = window_ms / 1000.0
+        self._queue = queue.Queue()
+        self._batch_sizes = deque(maxlen=history)
+        self._wait_ms = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._batches = 0
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, features) -> Future:
+        future = Future()
+        self._queue.put((features, future, time.perf_counter()))
+        return future
+
+    def predict(self, features):
+        """Submit one row and block until its batch has been scored."""
+        return self.submit(features).result()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = item[2] + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        started = time.perf_counter()
+        futures = [future for _, future, _ in batch]
+        try:
+            labels = self.predict_rows([features for features, _, _ in batch])
+        except Exception as exc:
+            logging.exception("Micro-batch of %d failed: %s", len(batch), exc)
+            for future in futures:
+                future.set_exception(exc)
+        else:
+            for future, label in zip(futures, labels):
+                future.set_result(label)
+
+        with self._lock:
+            self._requests += len(batch)
+            self._batches += 1
+            self._batch_sizes.append(len(batch))
+            self._wait_ms.extend((started - enqueued) * 1000 for _, _, enqueued in batch)
+
+    def stats(self) -> dict:
+        with self._lock:
+            sizes = np.asarray(self._batch_sizes, dtype=float)
+            waits = np.asarray(self._wait_ms, dtype=float)
+            return {
+                "queue_depth": self._queue.qsize(),
+                "requests": self._requests,
+                "batches": self._batches,
+                "max_batch_size": self.max_batch_size,
+                "window_ms": self.window * 1000,
+                "batch_size_mean": round(float(sizes.mean()), 2) if sizes.size else 0.0,
+                "batch_size_max": int(sizes.max()) if sizes.size else 0,
+                "wait_ms_p50": round(float(np.percentile(waits, 50)), 3) if waits.size else 0.0,
+                "wait_ms_p99": round(float(np.percentile(waits, 99)), 3) if waits.size else 0.0,
+            }
@@ -0,0 +1,151 @@
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import hashlib
+from src.logger import logging
+from src.exception import MyException
+from src.utils.main_utils import load_object
+from src.constants import MODEL_NAME, MODEL_VERSION, MODEL_CACHE_DIR, MODEL_DIR, MODEL_PATH, MODEL_OFFLINE
+from src.constants import LINEAR_MODEL_PATH
+from src.constants import MLFLOW_TRACKING_URI
+
+MANIFEST_FILE = "manifest.json"
+
+
+def _sha256(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _hash_tree(root: str) -> dict:
+    files = {}
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, root)
+            if rel != MANIFEST_FILE:
+                files[rel] = _sha256(path)
+    return files
+
+
+class ModelResolver:
+    """
+    Resolves the serving model without depending on the network at startup.
+
+    Resolution order:
+      1. Local cache  models/cache/<name>/<version>/ , verified against the
+         SHA-256 manifest written when it was downloaded.
+      2. The MLflow registry (models:/<name>/<version>), downloaded once into
+         the cache. Skipped when offline.
+      3. The local training artifacts in models/ (preprocessor.joblib +
+         model.joblib), assembled into the same sklearn Pipeline that
+         training logs to MLflow.
+
+    The version is always pinned explicitly; aliases such as "latest" are
+    rejected so a restart never silently picks up a different model.
+
+    mlflow and sklearn are imported only when a source that needs them is used.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, model_version: str = MODEL_VERSION,
+                 cache_dir: str = MODEL_CACHE_DIR, offline: bool = MODEL_OFFLINE):
+        if not str(model_version).isdigit():
+            raise ValueError(f"Model version must be pinned to a number, got {model_version!r}")
+        self.model_name = model_name
+        self.model_version = str(model_version)
+        self.model_uri = f"models:/{model_name}/{self.model_version}"
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.version_dir = os.path.join(cache_dir, model_name, self.model_version)
+
+    def verify(self) -> bool:
+        """
+        True if the cached artifact exists and matches its manifest.
+        """
+        manifest_path = os.path.join(self.version_dir, MANIFEST_FILE)
+        if not os.path.isfile(manifest_path):
+            return False
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("model_uri") != self.model_uri:
+            return False
+        return manifest.get("files") == _hash_tree(self.version_dir)
+
+    def download(self) -> str:
+        """
+        Download the pinned registry version into the cache and write its manifest.
+        """
+        import mlflow.artifacts
+
+        mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
+        os.makedirs(os.path.dirname(self.version_dir), exist_ok=True)
+        staging = os.path.join(os.path.dirname(self.version_dir), f".staging-{uuid.uuid4().hex}")
+        try:
+            local_path = mlflow.artifacts.download_artifacts(artifact_uri=self.model_uri, dst_path=staging)
+            manifest = {
+                "model_uri": self.model_uri,
+                "downloaded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "files": _hash_tree(local_path),
+            }
+            with open(os.path.join(local_path, MANIFEST_FILE), "w") as f:
+                json.dump(manifest, f, indent=2)
+
+            shutil.rmtree(self.version_dir, ignore_errors=True)
+            os.replace(local_path, self.version_dir)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        logging.info(f"Cached {self.model_uri} at {self.version_dir}")
+        return self.version_dir
+
+    def load_fallback(self):
+        """
+        Assemble the model from the local training artifacts in models/.
+        """
+        from sklearn.pipeline import Pipeline
+
+        preprocessor = load_object(os.path.join(MODEL_DIR, "preprocessor.joblib"))
+        model = load_object(MODEL_PATH)
+        return Pipeline(steps=[("preprocessor", preprocessor), ("classifier", model)])
+
+    def linear_model_path(self, source: str) -> str:
+        """
+        Where the folded float32 linear artifact for the resolved model lives
+        (logged next to the MLflow model, or LINEAR_MODEL_PATH for "local").
+        """
+        if source == "local":
+            return LINEAR_MODEL_PATH
+        return os.path.join(self.version_dir, os.path.basename(LINEAR_MODEL_PATH))
+
+    @staticmethod
+    def _load_pyfunc(path: str):
+        import mlflow.pyfunc
+
+        return mlflow.pyfunc.load_model(path)
+
+    def resolve(self):
+        """
+        Return (model, source) where source is "cache", "registry" or "local".
+        """
+        try:
+            if self.verify():
+                return self._load_pyfunc(self.version_dir), "cache"
+            if os.path.isdir(self.version_dir):
+                logging.warning(f"Cached model at {self.version_dir} failed its integrity check; discarding")
+                shutil.rmtree(self.version_dir, ignore_errors=True)
+
+            if not self.offline:
+                try:
+                    return self._load_pyfunc(self.download()), "registry"
+                except Exception as e:
+                    logging.warning(f"Could not fetch {self.model_uri} from the registry: {e}")
+
+            logging.warning(f"Falling back to local artifacts in {MODEL_DIR}")
+            return self.load_fallback(), "local"
+        except Exception as e:
+            raise MyException(e, sys)
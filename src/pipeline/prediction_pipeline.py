@@ -1,56 +1,167 @@
 import os
-import librosa
+import io
+import time
+import soundfile as sf
 import numpy as np
 import pandas as pd
-import mlflow
-import mlflow.pyfunc
-from src.constants import MLFLOW_TRACKING_URI
-from src.components.feature_extraction import FeatureExtractor
+from src.components.feature_extraction import FeatureExtractor, RunningFeatureMean
+from src.components.audio_ingestion import AudioIngestor
 from src.utils.main_utils import load_object
-from src.constants import SAMPLE_RATE, DURATION, MODEL_DIR
+from src.utils.feature_cache import FeatureCache
+from src.pipeline.model_resolver import ModelResolver
+from src.pipeline.micro_batcher import MicroBatcher
+from src.components.linear_export import FastLinearModel
+from src.constants import SAMPLE_RATE, DURATION, MODEL_DIR, MODEL_VERSION, PREDICT_BATCH_WORKERS
+from src.constants import STREAM_WINDOW_SECONDS, STREAM_HOP_SECONDS, STREAM_MIN_SECONDS
+from src.constants import PREDICT_BATCH_WINDOW_MS, PREDICT_MAX_BATCH_SIZE, FAST_LINEAR
+from concurrent.futures import ThreadPoolExecutor
 from src.logger import logging
 
 
-mlflow.set_tracking_uri(
-    MLFLOW_TRACKING_URI
-)
-
-
 class AudioPredictor:
     """
     Predicts speaker accent from an audio file by:
-      1. Loading a registered MLflow model (with preprocessing inside)
+      1. Loading a pinned MLflow model version (with preprocessing inside),
+         from the local cache when possible (see ModelResolver)
       2. Extracting MFCC+ZCR+RMSE features from raw audio
       3. Feeding features directly to the model
       4. Decoding the predicted label with a saved label encoder
+
+    With batch_window_ms > 0, concurrent predict() calls are micro-batched
+    into one model call (see MicroBatcher). If the model was exported with
+    a folded float32 linear artifact (see linear_export.py), scoring skips
+    the model and runs in NumPy.
     """
 
-    def __init__(self, model_version: str = "2"):
+    def __init__(self, model_version: str = MODEL_VERSION, feature_cache: FeatureCache | None = None,
+                 batch_window_ms: float = PREDICT_BATCH_WINDOW_MS,
+                 max_batch_size: int = PREDICT_MAX_BATCH_SIZE):
         try:
-            # --- Load registered MLflow model ------------------------
-            self.model_uri = f"models:/AccentClassifier/{model_version}"
-            self.model = mlflow.pyfunc.PyFuncModel = mlflow.pyfunc.load_model(
-                self.model_uri
-            )
+            start = time.perf_counter()
+
+            # --- Resolve model: local cache -> registry -> models/ ----
+            resolver = ModelResolver(model_version=model_version)
+            self.model_uri = resolver.model_uri
+            self.model, self.model_source = resolver.resolve()
+            self.load_seconds = time.perf_counter() - start
 
-           
             self.label_encoder = load_object(
                 os.path.join(MODEL_DIR, "label_encoder.joblib")
             )
             self.fe = FeatureExtractor()
+            self.ingestor = self.fe.ingestor
+            self.feature_cache = feature_cache
+            self.columns = [f"mfcc_{i+1}" for i in range(self.fe.n_mfcc)] + ["zcr", "rmse"]
+            self.fast_model = self._load_fast_model(resolver.linear_model_path(self.model_source)) \
+                if FAST_LINEAR else None
+            self.batcher = (MicroBatcher(self._predict_rows, max_batch_size, batch_window_ms)
+                            if batch_window_ms > 0 else None)
 
-            logging.info("AudioPredictor initialised (model %s).", self.model_uri)
+            logging.info("AudioPredictor initialised (model %s from %s) in %.2fs.",
+                         self.model_uri, self.model_source, time.perf_counter() - start)
         except Exception as exc:
             logging.exception("Failed to initialise AudioPredictor: %s", exc)
             raise
 
 
-    def predict(self, audio_path: str) -> str | None:
+    def warm_up(self) -> float:
+        """
+        Run one dummy inference (resample, feature extraction, model call) so
+        lazy initialisation and JIT compilation happen before the first real
+        request. Returns the time spent.
+        """
+        start = time.perf_counter()
+        rng = np.random.default_rng(0)
+        y = (0.1 * rng.standard_normal(16000)).astype(np.float32)
+        y = self.ingestor.resample(y, 16000, SAMPLE_RATE)
+        self._predict_rows([self.fe.extract_features(y)])
+
+        elapsed = time.perf_counter() - start
+        logging.info("AudioPredictor warm-up finished in %.2fs.", elapsed)
+        return elapsed
+
+    def _load_fast_model(self, path: str):
+        """
+        Load the linear fast path if its artifact exists and agrees with the
+        resolved model on the artifact's reference rows; otherwise None.
+        """
+        if not os.path.isfile(path):
+            return None
+        try:
+            fast = FastLinearModel.load(path)
+            if not fast.matches(self.model, self.columns):
+                logging.warning("Linear artifact %s does not match the loaded model; not using it", path)
+                return None
+            self._fast_labels = np.asarray(
+                [str(label) for label in self.label_encoder.inverse_transform(fast.classes)]
+            )
+            logging.info("Using NumPy linear fast path from %s", path)
+            return fast
+        except Exception as exc:
+            logging.warning("Could not load linear artifact %s: %s", path, exc)
+            return None
+
+    def _predict_rows(self, rows: list) -> list[str]:
+        """
+        One vectorised model call for a list of feature rows; returns labels.
+        """
+        if self.fast_model is not None:
+            return self._fast_labels[self.fast_model.predict_index(np.asarray(rows))].tolist()
+        X = pd.DataFrame(rows, columns=self.columns)
+        y_pred = self.model.predict(X)
+        return [str(label) for label in self.label_encoder.inverse_transform(np.ravel(y_pred))]
+
+    def _extract(self, source, audio=None) -> list:
+        """
+        Decode and featurise a clip, going through the feature cache if enabled.
+        `source` is a file path, raw bytes or a binary file-like object. An
+        already decoded DecodedAudio skips decoding on a cache miss. Cache
+        errors are logged and the clip is featurised without the cache.
+        """
+        if not isinstance(source, (str, os.PathLike)):
+            data = source if isinstance(source, bytes) else source.read()
+            source = io.BytesIO(data)
+
+        key = None
+        if self.feature_cache is not None:
+            if isinstance(source, io.BytesIO):
+                content_hash = self.feature_cache.hash_bytes(source.getvalue())
+            else:
+                content_hash = self.feature_cache.hash_file(source)
+            config = {**self.fe.config(), "variants": ["original"], "padded": False}
+            key = self.feature_cache.make_key(content_hash, config)
+            try:
+                cached = self.feature_cache.get(key)
+            except Exception as exc:
+                logging.warning("Feature cache lookup failed, extracting instead: %r", exc)
+                cached = None
+            if cached is not None:
+                return list(cached[0])
+
+        if audio is not None:
+            y = audio.at(SAMPLE_RATE, DURATION)
+        else:
+            y = self.ingestor.load(source, SAMPLE_RATE, DURATION)
+        if y.size == 0:
+            raise ValueError("Audio file is empty or unreadable")
+
+        features = self.fe.extract_features(y)
+        if key is not None:
+            try:
+                self.feature_cache.put(key, np.asarray([features]))
+            except Exception as exc:
+                logging.warning("Could not cache features: %r", exc)
+        return features
+
+    def predict(self, audio_path: str, audio=None) -> str | None:
         """
         Parameters
         ----------
         audio_path : str
             Path to a .wav / .flac / .mp3 file.
+        audio : DecodedAudio | None
+            Optional already decoded audio_path (see AudioIngestor), reused
+            instead of decoding the file again.
 
         Returns
         -------
@@ -58,22 +169,16 @@ class AudioPredictor:
             Predicted accent label, or None if prediction failed.
         """
         try:
-            # --- Load & trim/pad audio --------------------------------
-            y, _ = librosa.load(audio_path, sr=SAMPLE_RATE, duration=DURATION)
-            if y.size == 0:
-                raise ValueError("Audio file is empty or unreadable")
-
-            # --- Feature extraction -----------------------------------
-            features = self.fe.extract_features(y)
+            # --- Load audio & extract features (cached) ---------------
+            features = self._extract(audio_path, audio)
             if features is None:
                 raise ValueError("Feature extractor returned None")
 
-            cols = [f"mfcc_{i+1}" for i in range(13)] + ["zcr", "rmse"]
-            X = pd.DataFrame([features], columns=cols)
-
             # --- Inference (pre‑processing is inside model) -----------
-            y_pred = self.model.predict(X)
-            decoded = self.label_encoder.inverse_transform(np.ravel(y_pred))[0]
+            if self.batcher is not None:
+                decoded = self.batcher.predict(features)
+            else:
+                decoded = self._predict_rows([features])[0]
 
             logging.info("Prediction complete: %s", decoded)
             return decoded
@@ -82,5 +187,106 @@ class AudioPredictor:
             logging.exception("Prediction failed: %s", exc)
             return None
 
+    def predict_stream(self, audio_path: str, window_seconds: float = STREAM_WINDOW_SECONDS,
+                       hop_seconds: float = STREAM_HOP_SECONDS):
+        """
+        Sliding-window accent inference over a recording of any length.
+
+        Audio is read block by block, so memory is bounded by one window no
+        matter how long the file is. Each window is resampled, featurised and
+        folded into a RunningFeatureMean; the model scores the window and the
+        running aggregate in one call.
+
+        Yields
+        ------
+        dict
+            {"window", "start", "end", "accent", "running_accent"} per window,
+            times in seconds.
+        """
+        running = RunningFeatureMean(len(self.columns))
+
+        with sf.SoundFile(audio_path) as f:
+            native_sr = f.samplerate
+            window = int(window_seconds * native_sr)
+            hop = int(hop_seconds * native_sr)
+            min_len = int(STREAM_MIN_SECONDS * native_sr)
+
+            blocks = f.blocks(blocksize=window, overlap=max(window - hop, 0),
+                              dtype="float32", always_2d=True)
+            for i, block in enumerate(blocks):
+                if i > 0 and len(block) < min_len:
+                    break
+
+                y = self.ingestor.resample(np.mean(block, axis=1), native_sr, SAMPLE_RATE)
+                features = self.fe.extract_features(y)
+                running.update(features, self.fe.n_frames(len(y)))
+
+                X = pd.DataFrame([features, running.mean], columns=self.columns)
+                window_label, running_label = self.label_encoder.inverse_transform(
+                    np.ravel(self.model.predict(X))
+                )
+
+                start = i * hop / native_sr
+                yield {
+                    "window": i,
+                    "start": round(start, 3),
+                    "end": round(start + len(block) / native_sr, 3),
+                    "accent": str(window_label),
+                    "running_accent": str(running_label),
+                }
+
+    def predict_batch(self, sources: list, n_jobs: int = PREDICT_BATCH_WORKERS) -> list[dict]:
+        """
+        Predict many clips at once.
+
+        Decoding and feature extraction run in a thread pool; the model is
+        then called once on the whole feature matrix.
+
+        Parameters
+        ----------
+        sources : list
+            File paths, raw bytes or binary file-like objects.
+        n_jobs : int
+            Number of decode/extract threads.
+
+        Returns
+        -------
+        list[dict]
+            One entry per source, in input order: {"index", "accent"} on
+            success or {"index", "error"} if that item failed.
+        """
+        results = [{"index": i} for i in range(len(sources))]
+
+        def extract(item):
+            idx, source = item
+            try:
+                return idx, self._extract(source), None
+            except Exception as exc:
+                return idx, None, str(exc)
+
+        with ThreadPoolExecutor(max_workers=max(1, n_jobs)) as executor:
+            extracted = list(executor.map(extract, enumerate(sources)))
+
+        ok_idx, rows = [], []
+        for idx, features, error in extracted:
+            if error is not None:
+                results[idx]["error"] = error
+            else:
+                ok_idx.append(idx)
+                rows.append(features)
+
+        if rows:
+            try:
+                for idx, label in zip(ok_idx, self._predict_rows(rows)):
+                    results[idx]["accent"] = label
+            except Exception as exc:
+                logging.exception("Batch prediction failed: %s", exc)
+                for idx in ok_idx:
+                    results[idx]["error"] = f"Prediction failed: {exc}"
+
+        logging.info("Batch prediction complete: %d items, %d failed",
+                     len(sources), sum("error" in r for r in results))
+        return results
+
 
 
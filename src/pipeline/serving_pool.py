@@ -0,0 +1,147 @@
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from src.logger import logging
+from src.constants import SERVE_WORKERS, SERVE_MAX_PENDING, SERVE_TIMEOUT_SECONDS
+
+
+class PoolSaturated(Exception):
+    """Raised when the pool already holds max_pending tasks or is shutting down."""
+
+
+class PoolTimeout(Exception):
+    """Raised when a task does not finish within the per-request timeout."""
+
+
+class BoundedWorkerPool:
+    """
+    Process pool for the CPU-bound parts of serving (decode-to-features,
+    inference, plotting).
+
+    At most max_pending tasks may be queued or running at once; further
+    submissions fail immediately with PoolSaturated instead of piling up, so
+    latency under bursts stays bounded and callers can answer 503. Each
+    request waits at most `timeout` seconds for its result. Workers are
+    spawned (not forked, the parent runs request threads) and each loads its
+    own AudioPredictor once in the initializer.
+    """
+
+    def __init__(self, n_workers: int = SERVE_WORKERS, max_pending: int = SERVE_MAX_PENDING,
+                 timeout: float = SERVE_TIMEOUT_SECONDS):
+        self.n_workers = max(1, n_workers)
+        self.max_pending = max(self.n_workers, max_pending)
+        self.timeout = timeout
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    def _release(self, future):
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+        self._slots.release()
+
+    def submit(self, fn, *args):
+        """
+        Queue fn(*args) on a worker; raises PoolSaturated when no slot is free.
+        """
+        if self._closed or not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PoolSaturated("shutting down" if self._closed else "too many pending requests")
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_flight += 1
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn, *args, timeout: float | None = None):
+        """
+        Submit fn(*args) and wait for the result. A task that times out is
+        cancelled if it has not started yet; otherwise it keeps its slot until
+        the worker finishes it, so the pending limit stays honest.
+        """
+        future = self.submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except FutureTimeout:
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeout(f"no result within {self.timeout if timeout is None else timeout}s")
+
+    def warm_up(self):
+        """
+        Start every worker (and load its model) before the first request.
+        """
+        start = time.perf_counter()
+        pids = {f.result() for f in [self._executor.submit(_worker_pid) for _ in range(self.n_workers)]}
+        logging.info(f"Serving pool warm: {len(pids)} worker(s) in {time.perf_counter() - start:.2f}s")
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting work; with wait=True let queued and running tasks finish.
+        """
+        self._closed = True
+        logging.info(f"Serving pool shutting down ({self._in_flight} task(s) in flight)")
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.n_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "closed": self._closed,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Worker side. Module-level so the tasks can be pickled by reference.
+
+_predictor = None
+
+def _init_worker():
+    global _predictor
+    from src.pipeline.prediction_pipeline import AudioPredictor
+    from src.utils.feature_cache import FeatureCache
+    # A worker runs one task at a time, so there is nothing to micro-batch
+    _predictor = AudioPredictor(feature_cache=FeatureCache(), batch_window_ms=0)
+    _predictor.warm_up()
+
+def _worker_pid():
+    return os.getpid()
+
+def predict_task(path, y=None, sr=None):
+    """
+    Predict one clip; y/sr carry an already-decoded waveform so the worker
+    does not decode the file again.
+    """
+    from src.components.audio_ingestion import DecodedAudio
+    audio = DecodedAudio(y, sr, _predictor.ingestor) if y is not None else None
+    return _predictor.predict(path, audio=audio)
+
+def predict_batch_task(sources):
+    return _predictor.predict_batch(sources)
+
+def render_task(y, sr, viz_type, mode):
+    from visualizer import render_visualization
+    return render_visualization(y, sr, viz_type, mode)
@@ -7,43 +7,51 @@ from from_root import from_root
 from src.components.model_training import ModelTrainer
 from src.components.model_evaluation import ModelEvaluator
 from src.components.visualization import log_confusion_matrix, log_learning_curve
+from src.components.diagnostics import TrainingDiagnostics
 import numpy as np
-import dagshub
 import mlflow.sklearn
 from src.constants import *
 from sklearn.pipeline import Pipeline
-from src.utils.main_utils import load_object
+from src.utils.main_utils import load_object, load_dataframe
+from src.components.linear_export import export_linear_model
+from src.utils.tracking_queue import TrackingQueue
 
-# Set MLflow/DagsHub tracking URI and credentials
-
-dagshub.init(repo_owner='Himanshu0518', repo_name='Accent-Recognition', mlflow=True)
-mlflow.set_experiment("Accent Recognition")
+def init_tracking():
+    """
+    Log to the local tracking store and start forwarding queued runs to the
+    DagsHub server in the background (credentials from the usual
+    MLFLOW_TRACKING_USERNAME / MLFLOW_TRACKING_PASSWORD variables). Called
+    from the entry point rather than at import so importing this module has
+    no side effects.
+    """
+    mlflow.set_tracking_uri(LOCAL_TRACKING_URI)
+    mlflow.set_experiment(MLFLOW_EXPERIMENT)
+    return TrackingQueue().start()
 
 def run_model_training():
-    train_csv = os.path.join(from_root(), "data", "preprocessed", "train_data.csv")
     logging.info("Starting model training...")
     trainer = ModelTrainer(model_path=MODEL_PATH)
-    model, model_name, model_params = trainer.initiate_model_training(train_csv)
+    model, model_name, model_params = trainer.initiate_model_training(TRAIN_DATA)
     logging.info("Model training completed.")
     return model, model_name, model_params
 
 def run_model_evaluation():
-    test_csv = os.path.join(from_root(), "data", "preprocessed", "test_data.csv")
     logging.info("Starting model evaluation...")
     evaluator = ModelEvaluator(model_path=MODEL_PATH)
-    metrics, y_pred, y_true = evaluator.initiate_model_evaluation(test_csv)
+    metrics, y_pred, y_true = evaluator.initiate_model_evaluation(TEST_DATA)
     logging.info("Model evaluation completed.")
     return metrics, y_pred, y_true
 
 # Entry Point
 if __name__ == "__main__":
     try:
-      
+        tracking_queue = init_tracking()
+
         model, model_name, model_params = run_model_training()
         metrics, y_pred, y_true = run_model_evaluation()
 
         # MLflow Logging
-        with mlflow.start_run():
+        with mlflow.start_run() as run:
             logging.info("Logging parameters and metrics to MLflow...")
 
             mlflow.log_param("model_name", model_name)
@@ -52,9 +60,19 @@ if __name__ == "__main__":
             for key, value in metrics.items():
                 mlflow.log_metric(key, value)
 
-            log_confusion_matrix(y_true, y_pred, labels=np.unique(y_true))
-           
-            log_learning_curve(model, train_csv= TRAIN_DATA, target_col="label")  
+            # CV metrics, confusion matrix and learning curve from one shared CV plan
+            train_df = load_dataframe(TRAIN_DATA)
+            diagnostics = TrainingDiagnostics(model).run(train_df.drop(columns=["label"]), train_df["label"],
+                                                         y_true, y_pred)
+            for key, value in diagnostics.metrics()["cv"].items():
+                mlflow.log_metric(f"cv_{key}", value)
+            cm = diagnostics.confusion_matrix()
+            diagnostics.timed("confusion_matrix",
+                              lambda: log_confusion_matrix(y_true, y_pred, labels=np.unique(y_true), cm=cm))
+            curve = diagnostics.learning_curve()
+            diagnostics.timed("learning_curve", lambda: log_learning_curve(curve, diagnostics.scoring))
+            diagnostics.save_report(DIAGNOSTICS_PATH)
+            mlflow.log_artifact(DIAGNOSTICS_PATH, artifact_path="diagnostics")
 
             try: 
                 prepeocesser = load_object(os.path.join(MODEL_DIR, "preprocessor.joblib"))
@@ -67,7 +85,22 @@ if __name__ == "__main__":
                 mlflow.log_artifact(MODEL_PATH, artifact_path="model")
                 logging.warning(f"Could not use mlflow.sklearn. Used log_artifact instead. Reason: {e}")
 
+            # Folded float32 weights for the NumPy serving fast path (linear models only)
+            if hasattr(model, "coef_"):
+                try:
+                    preprocessor = load_object(os.path.join(MODEL_DIR, "preprocessor.joblib"))
+                    export_linear_model(Pipeline(steps=[('preprocessor', preprocessor), ('classifier', model)]),
+                                        LINEAR_MODEL_PATH, columns=preprocessor.feature_names_in_)
+                    mlflow.log_artifact(LINEAR_MODEL_PATH, artifact_path="model")
+                except Exception as e:
+                    logging.warning(f"Linear fast-path export skipped: {e}")
+
             logging.info("All parameters, metrics, and model logged to MLflow.")
 
+        # Forwarding happens in the background; anything not uploaded within
+        # FORWARD_DRAIN_SECONDS stays queued for the next run
+        tracking_queue.enqueue(run.info.run_id, MLFLOW_EXPERIMENT)
+        tracking_queue.drain()
+
     except Exception as e:
         logging.error(f"Training + Evaluation pipeline failed: {e}")
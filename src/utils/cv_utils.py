@@ -0,0 +1,32 @@
+# src/utils/cv_utils.py
+#
+# Helpers shared by the cross-validation engines (hyperparameter search and
+# training diagnostics).
+
+import os
+import joblib
+import numpy as np
+
+
+def shared_matrix(X, folder):
+    """
+    Dump X once to `folder` and reopen it as a read-only memmap. joblib hands
+    a memmap to its workers by file reference, so every worker reads the same
+    pages instead of receiving its own pickled copy.
+    """
+    path = os.path.join(folder, "X.mmap")
+    joblib.dump(np.ascontiguousarray(X, dtype=np.float64), path)
+    return joblib.load(path, mmap_mode="r")
+
+
+def stratified_order(train_idx, y, rng):
+    """
+    Shuffle a training fold so that every prefix keeps the class proportions
+    (halving rounds and learning-curve sizes train on prefixes).
+    """
+    train_idx = rng.permutation(train_idx)
+    position = np.empty(len(train_idx))
+    for label in np.unique(y[train_idx]):
+        members = np.flatnonzero(y[train_idx] == label)
+        position[members] = (np.arange(len(members)) + 0.5) / len(members)
+    return train_idx[np.argsort(position, kind="stable")]
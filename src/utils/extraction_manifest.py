@@ -0,0 +1,90 @@
+import os
+import json
+import hashlib
+from src.utils.feature_cache import FeatureCache
+
+MANIFEST_FORMAT = "accent-extraction-manifest"
+MANIFEST_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+def config_digest(config: dict) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class ExtractionManifest:
+    """
+    Processing manifest stored inside a feature store directory.
+
+    One entry per source file (keyed by its path relative to the data
+    directory): label, SHA-256 of the audio, size/mtime, the digest of the
+    feature + augmentation config it was extracted with, and the row range
+    [offset, offset + n_rows) its features occupy in the store. An entry is
+    only written once its rows have been flushed, so after a crash every
+    entry still points at complete rows.
+
+    `failed` lists the files that could not be processed in the last run
+    (they are retried on the next one) and `shard` records which shard of
+    the dataset the store holds, if any.
+    """
+
+    def __init__(self, store_path: str, files: dict | None = None, failed: list | None = None,
+                 shard: dict | None = None):
+        self.store_path = store_path
+        self.files = files or {}
+        self.failed = failed or []
+        self.shard = shard
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.store_path, MANIFEST_FILE)
+
+    @classmethod
+    def load(cls, store_path: str):
+        path = os.path.join(store_path, MANIFEST_FILE)
+        if not os.path.isfile(path):
+            return cls(store_path)
+        with open(path, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != MANIFEST_FORMAT or manifest.get("version") != MANIFEST_VERSION:
+            return cls(store_path)
+        return cls(store_path, manifest["files"], manifest.get("failed"), manifest.get("shard"))
+
+    def save(self) -> None:
+        os.makedirs(self.store_path, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            manifest = {"format": MANIFEST_FORMAT, "version": MANIFEST_VERSION, "files": self.files,
+                        "failed": self.failed}
+            if self.shard is not None:
+                manifest["shard"] = self.shard
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def describe(file_path: str, previous: dict | None = None) -> dict:
+        """
+        Size, mtime and content hash of a source file. The hash of `previous`
+        is reused when size and mtime are unchanged, so unchanged files are
+        not read again.
+        """
+        stat = os.stat(file_path)
+        if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+            content_hash = previous["hash"]
+        else:
+            content_hash = FeatureCache.hash_file(file_path)
+        return {"hash": content_hash, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def current_entry(self, key: str, source: dict, label: str, config: str, n_rows_stored: int):
+        """
+        The entry for `key` if its rows are still valid for this source file,
+        label and config and lie inside the stored rows; otherwise None.
+        """
+        entry = self.files.get(key)
+        if entry is None:
+            return None
+        if entry["hash"] != source["hash"] or entry["config"] != config or entry["label"] != label:
+            return None
+        if entry["offset"] + entry["n_rows"] > n_rows_stored:
+            return None
+        return entry
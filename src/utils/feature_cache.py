@@ -0,0 +1,147 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import numpy as np
+from src.logger import logging
+from src.constants import FEATURE_CACHE_DIR, FEATURE_CACHE_MAX_BYTES
+
+
+class FeatureCache:
+    """
+    Content-addressed on-disk cache for feature vectors.
+
+    Entries are keyed by the SHA-256 of the audio bytes plus a hash of the
+    feature/augmentation config, so a clip is only recomputed when its content
+    or the config changes. Each entry is an (n_variants, n_features) array
+    stored as .npy. The cache is bounded by max_bytes and evicts least recently
+    used entries (access time is tracked through the file mtime).
+
+    One instance may be shared by threads: the in-memory index and the stats
+    are guarded by a lock. Other processes may share the directory, so an
+    entry can vanish at any time; that counts as a miss.
+    """
+
+    def __init__(self, cache_dir: str = FEATURE_CACHE_DIR, max_bytes: int = FEATURE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index = self._scan()
+
+    def _scan(self) -> dict:
+        index = {}
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".npy"):
+                    continue
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                index[name[:-4]] = (stat.st_size, stat.st_mtime)
+        return index
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npy")
+
+    @staticmethod
+    def hash_file(path: str, block_size: int = 1 << 20) -> str:
+        """
+        SHA-256 of a file's raw bytes.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        """
+        SHA-256 of an in-memory audio buffer.
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def make_key(content_hash: str, config: dict) -> str:
+        """
+        Combine an audio content hash with the feature config into a cache key.
+        """
+        config_blob = json.dumps(config, sort_keys=True, default=str)
+        return hashlib.sha256(f"{content_hash}:{config_blob}".encode()).hexdigest()
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            features = np.load(path)
+            os.utime(path)
+            entry = (os.path.getsize(path), os.path.getmtime(path))
+        except (ValueError, OSError):
+            with self._lock:
+                self.misses += 1
+                self._index.pop(key, None)
+            return None
+
+        with self._lock:
+            self._index[key] = entry
+            self.hits += 1
+        return features
+
+    def put(self, key: str, features) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temp file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(features))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        try:
+            entry = (os.path.getsize(path), os.path.getmtime(path))
+        except OSError:
+            # Evicted by another process in the meantime
+            return
+        with self._lock:
+            self._index[key] = entry
+            self._evict()
+
+    def _evict(self) -> None:
+        # Called with self._lock held
+        total = sum(size for size, _ in self._index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self._index.pop(key, None)
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._index),
+                "bytes": sum(size for size, _ in self._index.values()),
+            }
+
+    def log_stats(self) -> None:
+        logging.info(f"Feature cache stats: {self.stats()}")
@@ -0,0 +1,250 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from src.logger import logging
+from src.constants import FEATURE_WRITE_CHUNK_ROWS
+
+STORE_FORMAT = "accent-feature-store"
+STORE_VERSION = 1
+DATA_FILE = "data.f32"
+LABEL_FILE = "label.i32"
+SCHEMA_FILE = "schema.json"
+DATA_DTYPE = np.dtype("<f4")
+LABEL_DTYPE = np.dtype("<i4")
+
+
+def is_feature_store(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, SCHEMA_FILE))
+
+
+def read_schema(path: str) -> dict:
+    with open(os.path.join(path, SCHEMA_FILE), "r") as f:
+        schema = json.load(f)
+    if schema.get("format") != STORE_FORMAT:
+        raise ValueError(f"{path} is not a feature store")
+    return schema
+
+
+def write_feature_store(df: pd.DataFrame, path: str, label_col: str = "label", label_classes=None) -> None:
+    """
+    Write a feature DataFrame as a binary feature store directory:
+
+      data.f32     float32 feature matrix, row-major, shape (n_rows, n_columns)
+      label.i32    int32 label codes (only if label_col is present)
+      schema.json  column names, row count and label encoding
+
+    String labels are stored as codes into a sorted class list and decoded
+    again on read. Integer labels (already label-encoded) are stored as-is,
+    with label_classes recorded in the schema when given.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    label = None
+    if label_col in df.columns:
+        values = df[label_col]
+        if pd.api.types.is_integer_dtype(values):
+            codes = values.to_numpy()
+            classes = [str(c) for c in label_classes] if label_classes is not None else None
+            label = {"name": label_col, "classes": classes, "encoded": True}
+        else:
+            classes = sorted(values.astype(str).unique())
+            codes = pd.Categorical(values.astype(str), categories=classes).codes
+            label = {"name": label_col, "classes": classes, "encoded": False}
+        df = df.drop(columns=[label_col])
+        np.ascontiguousarray(codes, dtype=LABEL_DTYPE).tofile(os.path.join(path, LABEL_FILE))
+
+    np.ascontiguousarray(df.to_numpy(), dtype=DATA_DTYPE).tofile(os.path.join(path, DATA_FILE))
+
+    # Schema goes last so a store is only readable once its data is complete
+    schema = {
+        "format": STORE_FORMAT,
+        "version": STORE_VERSION,
+        "dtype": DATA_DTYPE.str,
+        "columns": list(df.columns),
+        "n_rows": len(df),
+        "label": label,
+        "complete": True,
+    }
+    _write_schema(path, schema)
+
+
+def _write_schema(path: str, schema: dict) -> None:
+    tmp_path = os.path.join(path, SCHEMA_FILE + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(schema, f, indent=2)
+    os.replace(tmp_path, os.path.join(path, SCHEMA_FILE))
+
+
+class FeatureStoreWriter:
+    """
+    Append rows to a feature store (and/or a CSV file) in fixed-size chunks.
+
+    Rows are buffered until chunk_rows are pending, then appended to
+    data.f32 / label.i32 and the schema's n_rows is advanced. Readers only
+    trust n_rows, so after a crash the store holds every flushed chunk and is
+    readable as is; "complete" stays False until close() succeeds.
+
+    Labels are strings encoded against the fixed `label_classes` list.
+
+    With append=True an existing store with the same columns and classes is
+    continued: any bytes past its n_rows (a chunk torn by a crash) are cut
+    off and new rows go after the last complete one.
+    """
+
+    def __init__(self, path: str | None, columns, label_col: str = "label", label_classes=None,
+                 csv_path: str | None = None, chunk_rows: int = FEATURE_WRITE_CHUNK_ROWS,
+                 append: bool = False):
+        self.path = path
+        self.columns = list(columns)
+        self.label_col = label_col
+        self.label_classes = [str(c) for c in label_classes] if label_classes is not None else None
+        self.csv_path = csv_path
+        self.chunk_rows = chunk_rows
+        self.n_rows = 0
+        self._rows, self._labels = [], []
+        self._class_index = {c: i for i, c in enumerate(self.label_classes or [])}
+
+        if path is not None and append and is_feature_store(path):
+            schema = read_schema(path)
+            classes = schema["label"]["classes"] if schema["label"] is not None else None
+            if schema["columns"] != self.columns or classes != self.label_classes:
+                raise ValueError(f"Cannot append to {path}: columns or label classes differ")
+            self.n_rows = schema["n_rows"]
+            with open(os.path.join(path, DATA_FILE), "r+b") as f:
+                f.truncate(self.n_rows * len(self.columns) * DATA_DTYPE.itemsize)
+            if self.label_classes is not None:
+                with open(os.path.join(path, LABEL_FILE), "r+b") as f:
+                    f.truncate(self.n_rows * LABEL_DTYPE.itemsize)
+            self._write_schema(complete=False)
+        elif path is not None:
+            os.makedirs(path, exist_ok=True)
+            for name in (SCHEMA_FILE, DATA_FILE, LABEL_FILE):
+                if os.path.exists(os.path.join(path, name)):
+                    os.remove(os.path.join(path, name))
+            open(os.path.join(path, DATA_FILE), "wb").close()
+            if self.label_classes is not None:
+                open(os.path.join(path, LABEL_FILE), "wb").close()
+            self._write_schema(complete=False)
+        if csv_path is not None:
+            os.makedirs(os.path.dirname(csv_path) or ".", exist_ok=True)
+            pd.DataFrame(columns=self.columns + ([label_col] if self.label_classes is not None else [])) \
+                .to_csv(csv_path, index=False)
+
+    def _write_schema(self, complete: bool) -> None:
+        label = None
+        if self.label_classes is not None:
+            label = {"name": self.label_col, "classes": self.label_classes, "encoded": False}
+        _write_schema(self.path, {
+            "format": STORE_FORMAT,
+            "version": STORE_VERSION,
+            "dtype": DATA_DTYPE.str,
+            "columns": self.columns,
+            "n_rows": self.n_rows,
+            "label": label,
+            "complete": complete,
+        })
+
+    @property
+    def n_pending(self) -> int:
+        return sum(len(r) for r in self._rows)
+
+    def append(self, rows, labels=None) -> None:
+        rows = np.atleast_2d(np.asarray(rows))
+        self._rows.append(rows)
+        if self.label_classes is not None:
+            self._labels.extend(labels)
+        if self.n_pending >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        rows = np.concatenate(self._rows)
+        if self.path is not None:
+            with open(os.path.join(self.path, DATA_FILE), "ab") as f:
+                np.ascontiguousarray(rows, dtype=DATA_DTYPE).tofile(f)
+            if self.label_classes is not None:
+                codes = np.fromiter((self._class_index[str(c)] for c in self._labels), dtype=LABEL_DTYPE)
+                with open(os.path.join(self.path, LABEL_FILE), "ab") as f:
+                    codes.tofile(f)
+        if self.csv_path is not None:
+            chunk = pd.DataFrame(rows, columns=self.columns)
+            if self.label_classes is not None:
+                chunk[self.label_col] = self._labels
+            chunk.to_csv(self.csv_path, mode="a", header=False, index=False)
+
+        self.n_rows += len(rows)
+        self._rows, self._labels = [], []
+        if self.path is not None:
+            self._write_schema(complete=False)
+
+    def close(self) -> None:
+        self.flush()
+        if self.path is not None:
+            self._write_schema(complete=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Keep what was computed; only a clean exit marks the store complete
+        if exc_type is None:
+            self.close()
+        else:
+            self.flush()
+        return False
+
+
+def read_feature_arrays(path: str, mmap: bool = True):
+    """
+    Return (X, y, schema) without building a DataFrame. X is a read-only
+    memory map when mmap is True; y holds the stored label codes (or None).
+    """
+    schema = read_schema(path)
+    if schema.get("complete") is False:
+        logging.warning(f"Feature store {path} is incomplete (interrupted write); reading {schema['n_rows']} rows")
+    shape = (schema["n_rows"], len(schema["columns"]))
+    data_path = os.path.join(path, DATA_FILE)
+
+    if mmap and shape[0] > 0 and shape[1] > 0:
+        X = np.memmap(data_path, dtype=DATA_DTYPE, mode="r", shape=shape)
+    else:
+        X = np.fromfile(data_path, dtype=DATA_DTYPE, count=shape[0] * shape[1]).reshape(shape)
+
+    y = None
+    if schema["label"] is not None:
+        y = np.fromfile(os.path.join(path, LABEL_FILE), dtype=LABEL_DTYPE, count=shape[0])
+    return X, y, schema
+
+
+def read_feature_store(path: str, mmap: bool = True) -> pd.DataFrame:
+    X, y, schema = read_feature_arrays(path, mmap=mmap)
+    df = pd.DataFrame(X, columns=schema["columns"], copy=False)
+
+    label = schema["label"]
+    if label is not None:
+        if label["encoded"]:
+            df[label["name"]] = y.astype(np.int64)
+        else:
+            df[label["name"]] = np.asarray(label["classes"], dtype=object)[y]
+
+    logging.info(f"Feature store loaded from {path} ({schema['n_rows']} rows)")
+    return df
+
+
+def export_feature_store_csv(path: str, csv_path: str, chunk_rows: int = FEATURE_WRITE_CHUNK_ROWS) -> None:
+    """
+    Write a feature store out as CSV, chunk by chunk.
+    """
+    X, y, schema = read_feature_arrays(path)
+    label = schema["label"]
+    columns = schema["columns"] + ([label["name"]] if label is not None else [])
+    pd.DataFrame(columns=columns).to_csv(csv_path, index=False)
+    for start in range(0, schema["n_rows"], chunk_rows):
+        chunk = pd.DataFrame(np.asarray(X[start:start + chunk_rows]), columns=schema["columns"])
+        if label is not None:
+            codes = y[start:start + chunk_rows]
+            chunk[label["name"]] = codes if label["encoded"] else np.asarray(label["classes"], dtype=object)[codes]
+        chunk.to_csv(csv_path, mode="a", header=False, index=False)
+    logging.info(f"CSV export written to {csv_path}")
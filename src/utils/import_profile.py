@@ -0,0 +1,67 @@
+# src/utils/import_profile.py
+#
+# Measures the import cost of a module in a fresh interpreter using
+# `python -X importtime` and checks it against a budget, e.g.
+#
+#   python -m src.utils.import_profile app --budget 1.5
+#
+# exits with status 1 when the cumulative import time exceeds the budget.
+
+import os
+import sys
+import argparse
+import subprocess
+from from_root import from_root
+from src.constants import IMPORT_BUDGET_SECONDS
+
+
+def profile_import(module: str) -> list[tuple[str, float, float]]:
+    """
+    Import `module` in a fresh interpreter and return (name, self_s, cumulative_s)
+    for every module it pulled in, top-level imports first.
+    """
+    env = dict(os.environ, PYTHONPATH=from_root())
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=from_root(), env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return rows
+
+
+def total_seconds(rows) -> float:
+    # Top-level entries (no indentation) partition the whole import
+    return sum(cumulative for name, _, cumulative in rows if not name.startswith("  "))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check a module's import time against a budget.")
+    parser.add_argument("module", nargs="?", default="app")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_SECONDS,
+                        help="maximum cumulative import time in seconds")
+    parser.add_argument("--top", type=int, default=15, help="number of heaviest imports to list")
+    args = parser.parse_args(argv)
+
+    rows = profile_import(args.module)
+    total = total_seconds(rows)
+
+    print(f"import {args.module}: {total:.3f}s (budget {args.budget:.3f}s)")
+    for name, _, cumulative in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"  {cumulative:8.3f}s  {name.strip()}")
+
+    if total > args.budget:
+        print(f"FAIL: import {args.module} exceeds its budget by {total - args.budget:.3f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
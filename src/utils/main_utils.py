@@ -3,13 +3,20 @@ import pandas as pd
 import joblib
 from src.logger import logging
 import yaml
+from src.utils.feature_store import read_feature_store, write_feature_store
 
 
 
-def load_dataframe(csv_path: str) -> pd.DataFrame:
+def load_dataframe(path: str) -> pd.DataFrame:
+    """
+    Load a DataFrame from a .csv file or a binary feature store directory.
+    """
     try:
-        logging.info(f"Loading DataFrame from {csv_path}")
-        df = pd.read_csv(csv_path)
+        logging.info(f"Loading DataFrame from {path}")
+        if path.endswith(".csv"):
+            df = pd.read_csv(path)
+        else:
+            df = read_feature_store(path)
         logging.info("DataFrame loaded successfully.")
         return df
     except Exception as e:
@@ -17,10 +24,21 @@ def load_dataframe(csv_path: str) -> pd.DataFrame:
         raise
 
 
-def save_dataframe(df: pd.DataFrame, path: str) -> None:
+def save_dataframe(df: pd.DataFrame, path: str, export_csv: bool = False, label_classes=None) -> None:
+    """
+    Save a DataFrame as CSV (path ends with .csv) or as a binary feature store.
+    With export_csv, a feature store is also exported next to it as <name>.csv.
+    """
     try:
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        df.to_csv(path, index=False)
+        if path.endswith(".csv"):
+            df.to_csv(path, index=False)
+        else:
+            write_feature_store(df, path, label_classes=label_classes)
+            if export_csv:
+                csv_path = os.path.splitext(path)[0] + ".csv"
+                df.to_csv(csv_path, index=False)
+                logging.info(f"CSV export written to {csv_path}")
         logging.info(f"DataFrame saved successfully at {path}")
     except Exception as e:
         logging.error(f"Failed to save DataFrame to {path}: {e}")
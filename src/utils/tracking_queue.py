@@ -0,0 +1,292 @@
+# src/utils/tracking_queue.py
+#
+# Store-and-forward for MLflow runs: training logs to a local tracking store
+# (fast, works offline) and finished runs are copied to the remote tracking
+# server in the background, with retries. Run `python -m src.utils.tracking_queue`
+# to see the queue or to forward what is left.
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from src.logger import logging
+from src.constants import (
+    LOCAL_TRACKING_URI, MLFLOW_TRACKING_URI, MLFLOW_QUEUE_DIR,
+    FORWARD_RETRY_SECONDS, FORWARD_RETRY_MAX_SECONDS, FORWARD_DRAIN_SECONDS,
+    FORWARD_REQUEST_TIMEOUT_SECONDS, FORWARD_REQUEST_MAX_RETRIES
+)
+
+LOCAL_RUN_TAG = "accent.local_run_id"
+FORWARDED_LOG = "forwarded.jsonl"
+# MLflow log_batch limits
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+
+
+class TrackingQueue:
+    """
+    Persistent queue of finished local runs waiting to be forwarded.
+
+    Each queued run is a small JSON ticket in queue_dir (local run id,
+    experiment name, attempts, next attempt time, last error), so runs
+    survive restarts and an unreachable server only delays them. A
+    background thread forwards due tickets: params, the full metric
+    history, tags and artifacts go to a new remote run tagged with the local
+    run id, which makes a retry after a partial upload replace that run
+    instead of duplicating it. Failed attempts back off exponentially from
+    retry_seconds up to retry_max_seconds.
+
+    Upload time per run is appended to forwarded.jsonl; stats() reports the
+    queue depth and upload totals.
+
+    MLflow's HTTP timeout and retry count are lowered for this process
+    (unless already set in the environment) so a hung server fails an
+    attempt quickly instead of blocking it for minutes.
+    """
+
+    def __init__(self, queue_dir: str = MLFLOW_QUEUE_DIR, local_uri: str = LOCAL_TRACKING_URI,
+                 remote_uri: str = MLFLOW_TRACKING_URI, retry_seconds: float = FORWARD_RETRY_SECONDS,
+                 retry_max_seconds: float = FORWARD_RETRY_MAX_SECONDS):
+        self.queue_dir = queue_dir
+        self.local_uri = local_uri
+        self.remote_uri = remote_uri
+        self.retry_seconds = retry_seconds
+        self.retry_max_seconds = retry_max_seconds
+        os.makedirs(self.queue_dir, exist_ok=True)
+        os.environ.setdefault("MLFLOW_HTTP_REQUEST_TIMEOUT", str(FORWARD_REQUEST_TIMEOUT_SECONDS))
+        os.environ.setdefault("MLFLOW_HTTP_REQUEST_MAX_RETRIES", str(FORWARD_REQUEST_MAX_RETRIES))
+
+        self._wake = threading.Condition()
+        self._stopping = False
+        self._thread = None
+        self._uploading = False
+        self._lock = threading.Lock()
+        self._forwarded = 0
+        self._failed_attempts = 0
+        self._upload_seconds = 0.0
+        self._last_upload_seconds = None
+
+    # ------------------------------------------------------------------ queue
+
+    def _ticket_path(self, run_id):
+        return os.path.join(self.queue_dir, f"{run_id}.json")
+
+    def _write_ticket(self, ticket):
+        path = self._ticket_path(ticket["run_id"])
+        with open(path + ".tmp", "w") as f:
+            json.dump(ticket, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def tickets(self) -> list[dict]:
+        tickets = []
+        for name in sorted(os.listdir(self.queue_dir)):
+            if name.endswith(".json"):
+                try:
+                    with open(os.path.join(self.queue_dir, name), "r") as f:
+                        tickets.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return sorted(tickets, key=lambda ticket: ticket["queued_at"])
+
+    def depth(self) -> int:
+        return len(self.tickets())
+
+    def enqueue(self, run_id: str, experiment_name: str) -> None:
+        """
+        Queue a finished local run for forwarding and wake the worker.
+        """
+        self._write_ticket({"run_id": run_id, "experiment": experiment_name, "queued_at": time.time(),
+                            "attempts": 0, "next_attempt": 0.0, "last_error": None})
+        logging.info(f"[TRACKING] Run {run_id} queued for {self.remote_uri} (queue depth {self.depth()})")
+        with self._wake:
+            self._wake.notify_all()
+
+    # ------------------------------------------------------------ forwarding
+
+    def _forward(self, ticket) -> str:
+        """
+        Copy one local run to the remote server; returns the remote run id.
+        """
+        from mlflow.tracking import MlflowClient
+        from mlflow.entities import Metric, Param
+
+        local = MlflowClient(tracking_uri=self.local_uri)
+        remote = MlflowClient(tracking_uri=self.remote_uri)
+        run = local.get_run(ticket["run_id"])
+
+        experiment = remote.get_experiment_by_name(ticket["experiment"])
+        experiment_id = (experiment.experiment_id if experiment is not None
+                         else remote.create_experiment(ticket["experiment"]))
+
+        # A previous attempt may have left a partial copy behind
+        for stale in remote.search_runs([experiment_id], f"tags.`{LOCAL_RUN_TAG}` = '{run.info.run_id}'"):
+            remote.delete_run(stale.info.run_id)
+
+        tags = {k: v for k, v in run.data.tags.items() if not k.startswith("mlflow.")}
+        tags[LOCAL_RUN_TAG] = run.info.run_id
+        remote_run = remote.create_run(experiment_id, start_time=run.info.start_time, tags=tags,
+                                       run_name=run.info.run_name)
+        remote_id = remote_run.info.run_id
+
+        params = [Param(k, v) for k, v in run.data.params.items()]
+        metrics = [Metric(m.key, m.value, m.timestamp, m.step)
+                   for key in run.data.metrics for m in local.get_metric_history(run.info.run_id, key)]
+        for i in range(0, len(params), MAX_PARAMS_PER_BATCH):
+            remote.log_batch(remote_id, params=params[i:i + MAX_PARAMS_PER_BATCH])
+        for i in range(0, len(metrics), MAX_METRICS_PER_BATCH):
+            remote.log_batch(remote_id, metrics=metrics[i:i + MAX_METRICS_PER_BATCH])
+
+        staging = tempfile.mkdtemp(prefix="accent-forward-")
+        try:
+            artifacts = local.download_artifacts(run.info.run_id, "", staging)
+            if os.listdir(artifacts):
+                remote.log_artifacts(remote_id, artifacts)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        remote.set_terminated(remote_id, status=run.info.status, end_time=run.info.end_time)
+        return remote_id
+
+    def forward_due(self) -> int:
+        """
+        Try every ticket whose retry time has come; returns how many were forwarded.
+        """
+        forwarded = 0
+        for ticket in self.tickets():
+            if self._stopping or ticket["next_attempt"] > time.time():
+                continue
+            start = time.perf_counter()
+            self._uploading = True
+            try:
+                remote_id = self._forward(ticket)
+            except Exception as e:
+                ticket["attempts"] += 1
+                delay = min(self.retry_seconds * 2 ** (ticket["attempts"] - 1), self.retry_max_seconds)
+                ticket["next_attempt"] = time.time() + delay
+                ticket["last_error"] = repr(e)[:500]
+                self._write_ticket(ticket)
+                with self._lock:
+                    self._failed_attempts += 1
+                logging.warning(f"[TRACKING] Forwarding run {ticket['run_id']} failed "
+                                f"(attempt {ticket['attempts']}, retry in {delay:.1f}s): {e}")
+                continue
+            finally:
+                self._uploading = False
+
+            elapsed = time.perf_counter() - start
+            with open(os.path.join(self.queue_dir, FORWARDED_LOG), "a") as f:
+                f.write(json.dumps({"run_id": ticket["run_id"], "remote_run_id": remote_id,
+                                    "attempts": ticket["attempts"] + 1, "upload_seconds": round(elapsed, 3),
+                                    "forwarded_at": time.time()}) + "\n")
+            os.remove(self._ticket_path(ticket["run_id"]))
+            with self._lock:
+                self._forwarded += 1
+                self._upload_seconds += elapsed
+                self._last_upload_seconds = elapsed
+            forwarded += 1
+            logging.info(f"[TRACKING] Run {ticket['run_id']} forwarded as {remote_id} in {elapsed:.2f}s "
+                         f"(queue depth {self.depth()})")
+        return forwarded
+
+    def _next_due_in(self):
+        tickets = self.tickets()
+        if not tickets:
+            return None
+        return max(0.0, min(ticket["next_attempt"] for ticket in tickets) - time.time())
+
+    def _loop(self):
+        while not self._stopping:
+            self.forward_due()
+            with self._wake:
+                if self._stopping:
+                    break
+                due_in = self._next_due_in()
+                self._wake.wait(timeout=self.retry_max_seconds if due_in is None else due_in)
+
+    # ------------------------------------------------------------- lifecycle
+
+    def start(self):
+        """
+        Start forwarding in a daemon thread (queued runs from earlier
+        sessions go first).
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="mlflow-forwarder", daemon=True)
+            self._thread.start()
+        return self
+
+    def drain(self, timeout: float = FORWARD_DRAIN_SECONDS) -> int:
+        """
+        Wait up to `timeout` seconds for the queue to empty, then stop the
+        worker. Returns the runs still queued; they stay on disk and are
+        forwarded by the next session or `python -m src.utils.tracking_queue`.
+        An upload still running at the deadline is left to the daemon thread
+        and does not delay the return. Returns early once nothing is being
+        uploaded and no queued run is due for a retry before the deadline.
+        """
+        deadline = time.monotonic() + timeout
+        while self.depth() and time.monotonic() < deadline:
+            due_in = self._next_due_in()
+            if not self._uploading and (due_in is None or due_in > deadline - time.monotonic()):
+                break
+            with self._wake:
+                self._wake.notify_all()
+            time.sleep(min(0.2, max(0.0, deadline - time.monotonic())))
+        self.stop(timeout=max(0.0, deadline - time.monotonic()))
+        depth = self.depth()
+        logging.info(f"[TRACKING] {self.stats()}")
+        if depth:
+            logging.warning(f"[TRACKING] {depth} run(s) still queued in {self.queue_dir}")
+        return depth
+
+    def stop(self, timeout: float | None = None) -> bool:
+        """
+        Stop the worker, waiting at most `timeout` seconds for an upload in
+        progress. Returns False if the worker was left running; it then exits
+        after that upload (its ticket stays queued if the process ends first).
+        """
+        self._stopping = True
+        with self._wake:
+            self._wake.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logging.warning("[TRACKING] An upload is still in progress; leaving it in the background")
+                return False
+            self._thread = None
+        self._stopping = False
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queue_depth": self.depth(),
+                "forwarded": self._forwarded,
+                "failed_attempts": self._failed_attempts,
+                "upload_seconds": round(self._upload_seconds, 3),
+                "last_upload_seconds": None if self._last_upload_seconds is None
+                else round(self._last_upload_seconds, 3),
+            }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show or forward the queued MLflow runs.")
+    parser.add_argument("--status", action="store_true", help="only list the queue")
+    parser.add_argument("--timeout", type=float, default=FORWARD_DRAIN_SECONDS,
+                        help="seconds to keep retrying before giving up")
+    args = parser.parse_args()
+
+    queue = TrackingQueue()
+    for ticket in queue.tickets():
+        print(f"{ticket['run_id']}  {ticket['experiment']}  attempts={ticket['attempts']}  "
+              f"last_error={ticket['last_error']}")
+    if not args.status:
+        for ticket in queue.tickets():
+            queue._write_ticket({**ticket, "next_attempt": 0.0})
+        remaining = queue.start().drain(args.timeout)
+        print(queue.stats())
+        sys.exit(1 if remaining else 0)
@@ -0,0 +1,143 @@
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from src.logger import logging
+from src.components.audio_ingestion import AudioIngestor
+from src.constants import UPLOAD_CACHE_MAX_BYTES, UPLOAD_TTL_SECONDS
+
+
+class UploadEntry:
+    def __init__(self, path: str, filename: str):
+        self.path = path
+        self.filename = filename
+        self.created = time.monotonic()
+        self.last_access = self.created
+        self.audio = None
+        self.renders = {}
+
+    @property
+    def nbytes(self) -> int:
+        return self.audio.nbytes if self.audio is not None else 0
+
+
+class UploadStore:
+    """
+    Per-upload session store for the web app.
+
+    Every upload gets its own ID and temp file, so concurrent users never
+    overwrite each other. The decoded waveform is kept in an LRU bounded by
+    max_bytes; under memory pressure only the array is dropped and it is
+    decoded again from the temp file on the next access. Uploads idle for
+    longer than ttl_seconds are removed together with their temp file.
+    """
+
+    def __init__(self, max_bytes: int = UPLOAD_CACHE_MAX_BYTES, ttl_seconds: float = UPLOAD_TTL_SECONDS,
+                 ingestor: AudioIngestor | None = None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.ingestor = ingestor or AudioIngestor()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, path: str, filename: str) -> str:
+        """
+        Register a saved temp file and return its upload ID.
+        """
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._entries[upload_id] = UploadEntry(path, filename)
+        self.purge_expired()
+        return upload_id
+
+    def get(self, upload_id: str) -> UploadEntry | None:
+        with self._lock:
+            entry = self._entries.get(upload_id)
+            if entry is None:
+                return None
+            entry.last_access = time.monotonic()
+            self._entries.move_to_end(upload_id)
+            return entry
+
+    def audio(self, upload_id: str):
+        """
+        Return the upload as DecodedAudio, decoding at most once while it
+        stays in memory. Resampled views are cached on the same object.
+        """
+        entry = self.get(upload_id)
+        if entry is None:
+            raise KeyError(upload_id)
+
+        audio = entry.audio
+        if audio is None:
+            audio = self.ingestor.decode(entry.path)
+            with self._lock:
+                entry.audio = audio
+            self._enforce_budget()
+        return audio
+
+    def get_render(self, upload_id: str, key):
+        """
+        Cached visualization for this upload, or None. Renders are small and
+        survive eviction of the decoded audio.
+        """
+        entry = self.get(upload_id)
+        return entry.renders.get(key) if entry is not None else None
+
+    def put_render(self, upload_id: str, key, render) -> None:
+        entry = self.get(upload_id)
+        if entry is not None:
+            entry.renders[key] = render
+
+    def remove(self, upload_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(upload_id, None)
+        if entry is not None:
+            self._delete_file(entry)
+
+    def purge_expired(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            expired = [uid for uid, entry in self._entries.items()
+                       if now - entry.last_access > self.ttl_seconds]
+            entries = [self._entries.pop(uid) for uid in expired]
+        for entry in entries:
+            self._delete_file(entry)
+        if entries:
+            logging.info(f"Removed {len(entries)} expired uploads")
+
+    def clear(self) -> None:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._delete_file(entry)
+
+    def _enforce_budget(self) -> None:
+        with self._lock:
+            total = sum(entry.nbytes for entry in self._entries.values())
+            # Oldest first; never drop the most recently used entry
+            for entry in list(self._entries.values())[:-1]:
+                if total <= self.max_bytes:
+                    break
+                total -= entry.nbytes
+                entry.audio = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "uploads": len(self._entries),
+                "decoded": sum(entry.audio is not None for entry in self._entries.values()),
+                "bytes": sum(entry.nbytes for entry in self._entries.values()),
+                **self.ingestor.timings(),
+            }
+
+    @staticmethod
+    def _delete_file(entry: UploadEntry) -> None:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"Could not delete temp file {entry.path}: {e}")
@@ -1,4 +1,5 @@
  let uploadedFile = null;
+        let uploadId = null;
 
         document.getElementById('audioFile').addEventListener('change', function(e) {
             if (e.target.files.length > 0) {
@@ -53,6 +54,7 @@
                 console.log("Upload response status:", response.status);
                 showLoading(false);
                 if (data.success) {
+                    uploadId = data.upload_id;
                     document.getElementById('predictBtn').style.display = 'inline-block';
                     document.getElementById('vizButtons').style.display = 'flex';
                     document.getElementById('uploadBtn').style.display = 'none';
@@ -70,7 +72,13 @@
             showLoading(true);
             
             fetch('/predict', {
-                method: 'POST'
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    upload_id: uploadId
+                })
             })
             .then(response => response.json())
             .then(data => {
@@ -96,17 +104,18 @@
                     'Content-Type': 'application/json',
                 },
                 body: JSON.stringify({
-                    type: type
+                    type: type,
+                    mode: 'data',
+                    upload_id: uploadId
                 })
             })
             .then(response => response.json())
             .then(data => {
                 showLoading(false);
                 if (data.success) {
-                    const vizImage = document.getElementById('vizImage');
                     const vizTitle = document.getElementById('vizTitle');
                     
-                    vizImage.src = 'data:image/png;base64,' + data.plot;
+                    drawVisualization(type, data.data);
                     vizTitle.textContent = type.charAt(0).toUpperCase() + type.slice(1).replace('_', ' ');
                     
                     document.getElementById('visualization').style.display = 'block';
@@ -120,6 +129,73 @@
             });
         }
 
+        // ---- Client-side rendering of /visualize data mode ----
+
+        function prepareCanvas() {
+            const canvas = document.getElementById('vizCanvas');
+            const ctx = canvas.getContext('2d');
+            ctx.fillStyle = '#ffffff';
+            ctx.fillRect(0, 0, canvas.width, canvas.height);
+            return { canvas, ctx };
+        }
+
+        function drawWaveform(data) {
+            const { canvas, ctx } = prepareCanvas();
+            const n = data.min.length;
+            const mid = canvas.height / 2;
+            const peak = Math.max(1e-6, ...data.max.map(Math.abs), ...data.min.map(Math.abs));
+            ctx.strokeStyle = '#1f77b4';
+            ctx.beginPath();
+            for (let i = 0; i < n; i++) {
+                const x = (i + 0.5) * canvas.width / n;
+                ctx.moveTo(x, mid - (data.max[i] / peak) * mid * 0.95);
+                ctx.lineTo(x, mid - (data.min[i] / peak) * mid * 0.95);
+            }
+            ctx.stroke();
+        }
+
+        function drawSpectrogram(data) {
+            const { canvas, ctx } = prepareCanvas();
+            const bytes = Uint8Array.from(atob(data.data), c => c.charCodeAt(0));
+            const image = ctx.createImageData(data.n_frames, data.n_mels);
+            for (let m = 0; m < data.n_mels; m++) {
+                for (let t = 0; t < data.n_frames; t++) {
+                    const v = bytes[m * data.n_frames + t];
+                    // Low mel bands at the bottom of the image
+                    const p = ((data.n_mels - 1 - m) * data.n_frames + t) * 4;
+                    image.data[p] = v;
+                    image.data[p + 1] = Math.round(v * v / 255);
+                    image.data[p + 2] = Math.round(255 - v * 0.6);
+                    image.data[p + 3] = 255;
+                }
+            }
+            createImageBitmap(image).then(bitmap => {
+                ctx.imageSmoothingEnabled = false;
+                ctx.drawImage(bitmap, 0, 0, canvas.width, canvas.height);
+            });
+        }
+
+        function drawLine(values, color) {
+            const { canvas, ctx } = prepareCanvas();
+            const peak = Math.max(1e-9, ...values);
+            ctx.strokeStyle = color;
+            ctx.lineWidth = 2;
+            ctx.beginPath();
+            values.forEach((v, i) => {
+                const x = i * canvas.width / Math.max(1, values.length - 1);
+                const y = canvas.height - (v / peak) * canvas.height * 0.95;
+                if (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);
+            });
+            ctx.stroke();
+        }
+
+        function drawVisualization(type, data) {
+            if (type === 'waveform') drawWaveform(data);
+            else if (type === 'mel_spectrogram') drawSpectrogram(data);
+            else if (type === 'zcr') drawLine(data.values, 'purple');
+            else if (type === 'rmse') drawLine(data.values, 'green');
+        }
+
         function displayResults(data) {
             // Show predicted accent
             document.getElementById('predictedAccent').textContent = data.predicted_accent;
@@ -133,6 +209,10 @@
         }
 
         function resetApp() {
+            if (uploadId) {
+                fetch('/upload/' + uploadId, { method: 'DELETE' });
+                uploadId = null;
+            }
             uploadedFile = null;
             document.getElementById('audioFile').value = '';
             document.getElementById('fileInfo').style.display = 'none';
@@ -1,18 +1,31 @@
 # visualizer.py
+#
+# matplotlib, seaborn and librosa.display are imported on first use so that
+# importing this module (and app.py) stays cheap; the data-mode helpers never
+# need them.
 
 import librosa
-import librosa.display
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
+import base64
+from src.constants import VIZ_POINTS
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
 
 def plot_waveform(y, sr):
+    import librosa.display
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 4))
     librosa.display.waveshow(y, sr=sr, ax=ax)
     ax.set_title("Waveform")
     return fig
 
 def plot_mel_spectrogram(y, sr):
+    import librosa.display
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 4))
     S = librosa.feature.melspectrogram(y=y, sr=sr)
     S_dB = librosa.power_to_db(S, ref=np.max)
@@ -22,6 +35,7 @@ def plot_mel_spectrogram(y, sr):
     return fig
 
 def plot_zcr(y):
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 4))
     zcr = librosa.feature.zero_crossing_rate(y)[0]
     ax.plot(zcr, color='purple')
@@ -31,6 +45,7 @@ def plot_zcr(y):
     return fig
 
 def plot_rmse(y):
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 4))
     rmse = librosa.feature.rms(y=y)[0]
     ax.plot(rmse, color='green')
@@ -39,7 +54,76 @@ def plot_rmse(y):
     ax.set_xlabel("Frames")
     return fig
 
+# ---------------------------------------------------------------------------
+# Data mode: compact, downsampled arrays the browser can draw itself
+
+def _pool(x, n_points, ufunc=None):
+    """Reduce the last axis of x to at most n_points buckets (mean by default)."""
+    n = x.shape[-1]
+    if n <= n_points:
+        return x
+    edges = np.linspace(0, n, n_points + 1).astype(int)
+    if ufunc is None:
+        return np.add.reduceat(x, edges[:-1], axis=-1) / np.diff(edges)
+    return ufunc.reduceat(x, edges[:-1], axis=-1)
+
+def waveform_data(y, sr, n_points=VIZ_POINTS):
+    return {
+        "duration": len(y) / sr,
+        "min": np.round(_pool(y, n_points, np.minimum), 4).tolist(),
+        "max": np.round(_pool(y, n_points, np.maximum), 4).tolist(),
+    }
+
+def mel_spectrogram_data(y, sr, n_points=VIZ_POINTS, top_db=80.0):
+    S = librosa.feature.melspectrogram(y=y, sr=sr)
+    S_dB = _pool(librosa.power_to_db(S, ref=np.max, top_db=top_db), n_points)
+    # Quantise [-top_db, 0] dB to uint8, lowest mel band first
+    quantised = np.round((np.clip(S_dB, -top_db, 0) + top_db) * (255 / top_db)).astype(np.uint8)
+    return {
+        "duration": len(y) / sr,
+        "n_mels": quantised.shape[0],
+        "n_frames": quantised.shape[1],
+        "db_range": [-top_db, 0.0],
+        "data": base64.b64encode(np.ascontiguousarray(quantised).tobytes()).decode(),
+    }
+
+def zcr_data(y, n_points=VIZ_POINTS):
+    zcr = librosa.feature.zero_crossing_rate(y)[0]
+    return {"n_frames": len(zcr), "values": np.round(_pool(zcr, n_points), 5).tolist()}
+
+def rmse_data(y, n_points=VIZ_POINTS):
+    rmse = librosa.feature.rms(y=y)[0]
+    return {"n_frames": len(rmse), "values": np.round(_pool(rmse, n_points), 5).tolist()}
+
+def fig_to_base64(fig):
+    """Convert matplotlib figure to base64 string"""
+    from io import BytesIO
+    plt = _pyplot()
+    img = BytesIO()
+    fig.savefig(img, format='png', bbox_inches='tight', dpi=100, facecolor='white')
+    img.seek(0)
+    plot_url = base64.b64encode(img.getvalue()).decode()
+    plt.close(fig)
+    return plot_url
+
+# Visualization type -> (matplotlib renderer, data-mode builder)
+VIZ_TYPES = {
+    'waveform': (plot_waveform, waveform_data),
+    'mel_spectrogram': (plot_mel_spectrogram, mel_spectrogram_data),
+    'zcr': (lambda y, sr: plot_zcr(y), lambda y, sr: zcr_data(y)),
+    'rmse': (lambda y, sr: plot_rmse(y), lambda y, sr: rmse_data(y)),
+}
+
+def render_visualization(y, sr, viz_type, mode='image'):
+    """Base64 PNG for mode 'image', a JSON-ready dict for mode 'data'."""
+    plot, data = VIZ_TYPES[viz_type]
+    if mode == 'data':
+        return data(y, sr)
+    return fig_to_base64(plot(y, sr))
+
 def plot_feature_importance(importance_dict):
+    import seaborn as sns
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 4))
     features = list(importance_dict.keys())
     importances = list(importance_dict.values())